@@ -0,0 +1,25 @@
+import streamlit as st
+
+from book_club_configs import CLUB_CONFIGS
+from book_club_dashboard import ClubConfig, show_cross_club_dashboard, show_dashboard
+
+# все клубы обслуживаются одним процессом: pandas и matplotlib импортируются
+# один раз, а кэши статистики, отзывов и графиков общие для всех страниц
+
+
+def get_club_page(config: ClubConfig) -> st.Page:
+    def show_club_dashboard() -> None:
+        show_dashboard(config=config)
+
+    return st.Page(page=show_club_dashboard, title=config.title, url_path=config.slug)
+
+
+def show_all_clubs_dashboard() -> None:
+    show_cross_club_dashboard(configs=CLUB_CONFIGS)
+
+
+page = st.navigation(
+    pages=[get_club_page(config=config) for config in CLUB_CONFIGS]
+    + [st.Page(page=show_all_clubs_dashboard, title="Все клубы", url_path="all_clubs")]
+)
+page.run()
@@ -0,0 +1,198 @@
+"""
+Benchmarks of the statistics pipeline on synthetic book lists.
+
+The synthetic lists have the schema of chitaem_vmeste_book_list.xlsx.
+
+    python book_club_benchmark.py [--sizes 100 10000 1000000] [--repeat 3]
+
+Every stage is run --repeat times and the best time is reported.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from book_club_charts import get_chart_specs, render_chart
+from book_club_cross_club import build_cross_club_data, compute_cross_club_stats
+from book_club_data import ingest_book_list, read_club_data, write_club_data
+from book_club_viz_utils import (
+    ALL_YEARS,
+    ClubStats,
+    compute_stats_table,
+    get_books_per_decade,
+    get_column_values_as_list,
+    get_pages_per_month,
+    get_values_by_freq,
+)
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+DATE_COLUMNS = ["meeting_year", "meeting_month", "meeting_day"]
+# openpyxl пишет и читает xlsx очень медленно, поэтому чтение xlsx
+# замеряется только на небольших списках
+MAX_XLSX_ROWS = 10_000
+# графики рассчитаны на списки клубного размера: на больших списках счётчики
+# доходят до тысяч, и локаторы с шагом 1 строят тысячи делений
+MAX_FIGURE_ROWS = 10_000
+
+NUM_COUNTRIES = 40
+NUM_GENRES = 30
+MAX_AUTHORS_PER_BOOK = 3
+MAX_GENRES_PER_BOOK = 3
+
+
+def format_list_column(items: np.ndarray, lengths: np.ndarray) -> list[str]:
+    """Join consecutive runs of items into strings like "[a, b, c]"."""
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    items_list = items.tolist()
+    return [
+        "[" + ", ".join(items_list[start:end]) + "]"
+        for start, end in zip(starts.tolist(), ends.tolist())
+    ]
+
+
+def make_book_list(num_books: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic book list with the columns of chitaem_vmeste_book_list.xlsx.
+
+    The number of distinct authors grows with the list, the numbers of
+    countries and genres do not; meetings are spread over 12 years.
+    """
+    rng = np.random.default_rng(seed=seed)
+    num_authors = max(10, 3 * int(num_books**0.5))
+    author_ids = np.arange(num_authors)
+    author_names = np.array([f"Автор {author_id}" for author_id in author_ids])
+    author_countries = np.array(
+        [
+            f"Страна {country_id}"
+            for country_id in rng.integers(NUM_COUNTRIES, size=num_authors)
+        ]
+    )
+    author_genders = rng.choice(["муж.", "жен."], size=num_authors)
+
+    num_book_authors = rng.integers(1, MAX_AUTHORS_PER_BOOK + 1, size=num_books)
+    book_author_ids = rng.choice(author_ids, size=num_book_authors.sum())
+    num_book_genres = rng.integers(1, MAX_GENRES_PER_BOOK + 1, size=num_books)
+    book_genres = np.array([f"жанр {genre_id}" for genre_id in range(NUM_GENRES)])[
+        rng.integers(NUM_GENRES, size=num_book_genres.sum())
+    ]
+
+    return pd.DataFrame(
+        {
+            "title": [f"«Книга {book_id}»" for book_id in range(num_books)],
+            "author": format_list_column(
+                items=author_names[book_author_ids], lengths=num_book_authors
+            ),
+            "author_country": format_list_column(
+                items=author_countries[book_author_ids], lengths=num_book_authors
+            ),
+            "author_gender": format_list_column(
+                items=author_genders[book_author_ids], lengths=num_book_authors
+            ),
+            "year_written_or_published": rng.integers(1600, 2025, size=num_books),
+            "genres": format_list_column(items=book_genres, lengths=num_book_genres),
+            "num_pages": rng.integers(50, 1500, size=num_books),
+            "meeting_year": rng.integers(2014, 2026, size=num_books),
+            "meeting_month": rng.integers(1, 13, size=num_books),
+            "meeting_day": rng.integers(1, 29, size=num_books),
+            "flyer_path": np.nan,
+            "links": "[]",
+        }
+    )
+
+
+def time_best(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def render_all_figures(year_stats: ClubStats) -> None:
+    for chart_spec in get_chart_specs(year_stats=year_stats).values():
+        render_chart(chart_spec=chart_spec)
+
+
+def run_benchmarks(num_books: int, repeat: int, work_dir: Path) -> dict[str, float]:
+    """Seconds per stage of the pipeline for a list of num_books books."""
+    books_df = make_book_list(num_books=num_books)
+    club_data = ingest_book_list(books_df=books_df)
+    snapshot_dir = work_dir / f"snapshot_{num_books}"
+    write_club_data(club_data=club_data, snapshot_dir=snapshot_dir)
+    year_stats = compute_stats_table(
+        club_data=club_data, date_columns_subset=DATE_COLUMNS
+    )[ALL_YEARS]
+
+    stages: dict[str, Callable[[], object]] = {}
+    if num_books <= MAX_XLSX_ROWS:
+        xlsx_path = work_dir / f"book_list_{num_books}.xlsx"
+        books_df.to_excel(xlsx_path, index=False)
+        stages["read_xlsx"] = lambda: pd.read_excel(io=xlsx_path)
+    stages |= {
+        "ingest_book_list": lambda: ingest_book_list(books_df=books_df),
+        "read_snapshot": lambda: read_club_data(snapshot_dir=snapshot_dir),
+        "get_column_values_as_list": lambda: get_column_values_as_list(
+            df=books_df, column_name="author"
+        ),
+        "get_values_by_freq": lambda: (
+            get_values_by_freq(values=club_data.book_authors["author"]),
+            get_values_by_freq(values=club_data.book_genres["genre"]),
+        ),
+        "get_books_per_decade": lambda: get_books_per_decade(
+            years=books_df["year_written_or_published"]
+        ),
+        "get_pages_per_month": lambda: get_pages_per_month(
+            df=books_df, date_columns_subset=DATE_COLUMNS
+        ),
+        "compute_stats_table": lambda: compute_stats_table(
+            club_data=club_data, date_columns_subset=DATE_COLUMNS
+        ),
+        # два клуба с одинаковыми списками: все книги и авторы общие
+        "compute_cross_club_stats": lambda: compute_cross_club_stats(
+            cross_club_data=build_cross_club_data(
+                club_datas={"a": club_data, "b": club_data},
+                date_columns_subsets={"a": DATE_COLUMNS, "b": DATE_COLUMNS},
+            )
+        ),
+    }
+    if num_books <= MAX_FIGURE_ROWS:
+        stages["render_figures"] = lambda: render_all_figures(year_stats=year_stats)
+    return {
+        stage_name: time_best(func=func, repeat=repeat)
+        for stage_name, func in stages.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output", type=Path, help="save the results to a json file as well"
+    )
+    args = parser.parse_args()
+
+    results: dict[int, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for num_books in args.sizes:
+            results[num_books] = run_benchmarks(
+                num_books=num_books, repeat=args.repeat, work_dir=Path(work_dir)
+            )
+            for stage_name, seconds in results[num_books].items():
+                print(f"{num_books:>9} {stage_name:<27} {seconds * 1000:>12.1f} ms")
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+from book_club_vega_lite import get_vega_lite_specs
+from book_club_viz_utils import ClubStats
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MultipleLocator
+
+# как строить графики в приложении: "matplotlib" - картинки на сервере,
+# "vega_lite" - данные для графиков, которые рисует браузер
+CHART_BACKEND_ENV_VAR = "BOOK_CLUB_CHART_BACKEND"
+CHART_BACKENDS = ("matplotlib", "vega_lite")
+
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FIGURE_RENDER_MAX_WORKERS = 4
+# те же настройки, с которыми st.pyplot сохраняет график
+SAVEFIG_DPI = 200
+
+FIGURE_CACHE_KEY = tuple[str, str, str, str]  # (график, год, хэш файла, формат)
+CHART_SPEC = tuple[Callable[..., "Figure"], dict]  # (функция построения, аргументы)
+
+
+# matplotlib импортируется при построении первого графика, а не при старте:
+# графики приложения строятся в пуле процессов, и процессу сервера matplotlib
+# не нужен вовсе.
+# графики строятся через Figure, а не через plt.subplots: pyplot хранит
+# глобальное состояние и небезопасен, когда несколько сессий рендерят графики
+# одновременно в разных потоках
+def create_figure(figsize: tuple[float, float] | None = None) -> "Figure":
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=figsize)
+
+
+def create_multiple_locator(base: float) -> "MultipleLocator":
+    from matplotlib.ticker import MultipleLocator
+
+    return MultipleLocator(base=base)
+
+
+def plot_authors_barh(authors_by_freq: list[tuple[str, int]]) -> "Figure":
+    fig = create_figure(figsize=(10, 20))
+    ax = fig.subplots()
+    ax.barh(
+        y=range(len(authors_by_freq)),
+        width=[item[1] for item in authors_by_freq],
+        align="center",
+    )
+    ax.set_yticks(ticks=range(len(authors_by_freq)))
+    ax.set_yticklabels(labels=[item[0] for item in authors_by_freq])
+    ax.invert_yaxis()
+    ax.xaxis.set_major_locator(locator=create_multiple_locator(base=1))
+    ax.grid(axis="x", linestyle="dashed")
+    ax.set_xlabel(xlabel="Количество книг")
+    return fig
+
+
+def plot_pie(values_by_freq: list[tuple[str, int]], unit: str) -> "Figure":
+    fig = create_figure()
+    ax = fig.subplots()
+    ax.pie(
+        x=[item[1] for item in values_by_freq],
+        labels=[f"{item[0]}\n({item[1]} {unit})" for item in values_by_freq],
+        autopct="%1.1f%%",
+        startangle=90,
+        explode=[0.1] * len(values_by_freq),
+    )
+    ax.axis("equal")
+    return fig
+
+
+def plot_genders_bar(genders_by_freq: list[tuple[str, int]]) -> "Figure":
+    fig = create_figure()
+    ax = fig.subplots()
+    ax.bar(
+        x=[item[0] for item in genders_by_freq],
+        height=[item[1] for item in genders_by_freq],
+    )
+    ax.set_xticks(ticks=range(len(genders_by_freq)))
+    ax.set_xticklabels(labels=[item[0] for item in genders_by_freq], rotation=45)
+    return fig
+
+
+def plot_decades_bar(decades: list[str], num_books: list[int]) -> "Figure":
+    fig = create_figure()
+    ax = fig.subplots()
+    # по позициям, а не по подписям: заглушка "..." может встречаться несколько раз
+    ax.bar(x=range(len(decades)), height=num_books)
+    ax.set_xticks(ticks=range(len(decades)), labels=decades)
+    ax.xaxis.set_tick_params(rotation=75)
+    ax.yaxis.set_major_locator(locator=create_multiple_locator(base=1))
+    ax.grid(axis="y", linestyle="dashed")
+    ax.set_ylabel(ylabel="Количество книг")
+    return fig
+
+
+def plot_pages_per_month_bar(pages_per_month: "pd.Series[int]") -> "Figure":
+    fig = create_figure(figsize=(20, 10))
+    ax = fig.subplots()
+    ax.bar(
+        x=[f"{period.month}-{period.year}" for period in pages_per_month.index],
+        height=pages_per_month.to_list(),
+    )
+    ax.xaxis.set_tick_params(rotation=75)
+    ax.grid(axis="y", linestyle="dashed")
+    ax.set_ylabel(ylabel="Количество страниц")
+    return fig
+
+
+def plot_pages_hist(num_pages: list[int]) -> "Figure":
+    fig = create_figure()
+    ax = fig.subplots()
+    ax.hist(x=num_pages, bins=20)
+    ax.xaxis.set_major_locator(locator=create_multiple_locator(base=100))
+    ax.yaxis.set_major_locator(locator=create_multiple_locator(base=1))
+    ax.set_xlim(left=0)
+    ax.set_xlabel(xlabel="Количество страниц")
+    ax.set_ylabel(ylabel="Количество книг")
+    ax.grid(axis="y", linestyle="dashed")
+    return fig
+
+
+def get_chart_specs(year_stats: ClubStats) -> dict[str, CHART_SPEC]:
+    """
+    All charts of the statistics page by chart kind.
+
+    A chart is described by its plot function and arguments rather than by
+    a closure, so it can be sent to another process to be rendered there.
+    """
+    return {
+        "authors": (
+            plot_authors_barh,
+            {"authors_by_freq": year_stats.authors_by_freq},
+        ),
+        "book_countries": (
+            plot_pie,
+            {"values_by_freq": year_stats.book_countries_by_freq, "unit": "кн."},
+        ),
+        "author_countries": (
+            plot_pie,
+            {"values_by_freq": year_stats.author_countries_by_freq, "unit": "ав."},
+        ),
+        "author_genders_bar": (
+            plot_genders_bar,
+            {"genders_by_freq": year_stats.author_genders_by_freq},
+        ),
+        "author_genders_pie": (
+            plot_pie,
+            {"values_by_freq": year_stats.author_genders_by_freq, "unit": "ав."},
+        ),
+        "decades": (
+            plot_decades_bar,
+            {"decades": year_stats.decades, "num_books": year_stats.books_per_decade},
+        ),
+        "genres": (
+            plot_pie,
+            {"values_by_freq": year_stats.genres_by_freq, "unit": "кн."},
+        ),
+        "pages_per_month": (
+            plot_pages_per_month_bar,
+            {"pages_per_month": year_stats.pages_per_month},
+        ),
+        "pages_hist": (
+            plot_pages_hist,
+            {"num_pages": year_stats.num_pages},
+        ),
+    }
+
+
+def render_figure(fig: "Figure", image_format: str = "png") -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=image_format, dpi=SAVEFIG_DPI, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_chart(chart_spec: CHART_SPEC, image_format: str = "png") -> bytes:
+    plot_func, plot_kwargs = chart_spec
+    return render_figure(fig=plot_func(**plot_kwargs), image_format=image_format)
+
+
+class FigureCache:
+    """
+    LRU cache of rendered charts (PNG/SVG bytes) with a memory cap.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Total size of stored images; least recently used charts are evicted
+        once it is exceeded.
+    """
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self._images: OrderedDict[FIGURE_CACHE_KEY, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def get(self, key: FIGURE_CACHE_KEY) -> bytes | None:
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key: FIGURE_CACHE_KEY, image: bytes) -> None:
+        with self._lock:
+            if key in self._images:
+                self.num_bytes -= len(self._images.pop(key))
+            # картинку больше всего кэша не сохраняем, иначе она вытеснит всё
+            if len(image) > self.max_bytes:
+                return
+            self._images[key] = image
+            self.num_bytes += len(image)
+            while self.num_bytes > self.max_bytes:
+                _, evicted_image = self._images.popitem(last=False)
+                self.num_bytes -= len(evicted_image)
+
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """One chart cache per process, shared by all sessions."""
+    return FigureCache()
+
+
+@st.cache_resource
+def get_render_pool() -> ProcessPoolExecutor:
+    """
+    One pool of chart rendering processes, shared by all sessions.
+
+    matplotlib holds the GIL while rendering, so charts are rendered in
+    parallel only in separate processes. spawn instead of fork: the
+    Streamlit server runs many threads, and forking them is unsafe.
+    """
+    return ProcessPoolExecutor(
+        max_workers=min(FIGURE_RENDER_MAX_WORKERS, os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context(method="spawn"),
+    )
+
+
+def replace_render_pool(broken_pool: ProcessPoolExecutor) -> None:
+    """
+    Drop the cached render pool if it is broken_pool.
+
+    A pool whose worker has died (e.g. killed by the OOM killer) rejects
+    every later task; the next get_render_pool() creates a new one. Another
+    session may have replaced the pool already, then it is kept.
+    """
+    if get_render_pool() is broken_pool:
+        get_render_pool.clear()
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_render(chart_spec: CHART_SPEC) -> tuple[Future[bytes], ProcessPoolExecutor]:
+    """Submit the chart to the render pool; returns the future and the pool."""
+    render_pool = get_render_pool()
+    try:
+        return render_pool.submit(render_chart, chart_spec), render_pool
+    except BrokenProcessPool:
+        replace_render_pool(broken_pool=render_pool)
+        render_pool = get_render_pool()
+        return render_pool.submit(render_chart, chart_spec), render_pool
+
+
+def get_chart_backend() -> str:
+    chart_backend = os.environ.get(CHART_BACKEND_ENV_VAR, CHART_BACKENDS[0])
+    if chart_backend not in CHART_BACKENDS:
+        raise ValueError(
+            f"{CHART_BACKEND_ENV_VAR} must be one of {CHART_BACKENDS}, "
+            f"got {chart_backend!r}"
+        )
+    return chart_backend
+
+
+def show_figures(
+    figure_placeholders: dict[str, DeltaGenerator],
+    year_stats: ClubStats,
+    year_filter: str,
+    data_file_hash: str,
+) -> None:
+    """
+    Show charts in their placeholders (st.empty()), by chart kind.
+
+    With the matplotlib backend, cached charts are shown at once; the rest
+    are rendered in the process pool at the same time and shown as soon as
+    each one is ready. With the vega_lite backend, only the aggregated
+    values are sent and the browser draws the charts.
+    """
+    if get_chart_backend() == "vega_lite":
+        vega_lite_specs = get_vega_lite_specs(year_stats=year_stats)
+        for chart_kind, placeholder in figure_placeholders.items():
+            placeholder.vega_lite_chart(
+                spec=vega_lite_specs[chart_kind], use_container_width=True
+            )
+        return
+
+    chart_specs = get_chart_specs(year_stats=year_stats)
+    figure_cache = get_figure_cache()
+    render_futures: dict[
+        Future[bytes],
+        tuple[FIGURE_CACHE_KEY, DeltaGenerator, CHART_SPEC, ProcessPoolExecutor],
+    ] = {}
+    for chart_kind, placeholder in figure_placeholders.items():
+        key = (chart_kind, year_filter, data_file_hash, "png")
+        image = figure_cache.get(key=key)
+        if image is None:
+            chart_spec = chart_specs[chart_kind]
+            future, render_pool = submit_render(chart_spec=chart_spec)
+            render_futures[future] = (key, placeholder, chart_spec, render_pool)
+        else:
+            placeholder.image(image=image, use_container_width=True)
+
+    for future in as_completed(render_futures):
+        key, placeholder, chart_spec, render_pool = render_futures[future]
+        try:
+            image = future.result()
+        except BrokenProcessPool:
+            # пул сломался во время рендеринга: следующие запросы получат
+            # новый пул, а этот график строится здесь же, в процессе сервера
+            replace_render_pool(broken_pool=render_pool)
+            image = render_chart(chart_spec=chart_spec)
+        figure_cache.put(key=key, image=image)
+        placeholder.image(image=image, use_container_width=True)
+
+
+def show_section(title: str, anchor: str, key: str) -> bool:
+    """
+    Render a statistics section header with a toggle.
+
+    Returns True if the section is open and its content should be computed
+    and rendered. The toggle state is kept between reruns, so an opened
+    section stays open when another year is chosen.
+    """
+    st.header(body=title, anchor=anchor, divider=True)
+    return st.toggle(label="Показать", key=f"show_section_{key}")
@@ -0,0 +1,64 @@
+from book_club_dashboard import ClubConfig, ClubTexts
+
+CHITAEM_VMESTE_CONFIG = ClubConfig(
+    slug="chitaem_vmeste",
+    title="Книжный клуб «Читаем вместе», г. Алматы",
+    data_file_path="chitaem_vmeste_files/chitaem_vmeste_book_list.xlsx",
+    date_columns=("meeting_year", "meeting_month", "meeting_day"),
+    intro=(
+        "Книжный клуб «Читаем вместе» (г. Алматы). Существует с июля 2014 года.",
+        "Обсуждения книг - 1 раз в месяц.",
+        "Присоединяйтесь! Будем читать вместе.",
+    ),
+    links=(
+        "ВК: https://vk.com/chitaemvmestealmaty/",
+        "Инстаграм: https://www.instagram.com/chitaemvmestealmaty/",
+        "Телеграм: https://t.me/+s7snk1T6nJ5kNzUy/",
+        (
+            "Список предложенных на будущее книг: "
+            "https://docs.google.com/document/d/1242Tldk4A7TYL7UITHvGOSMZeyjIA9S_tLM-KKjER9A/edit?usp=sharing"
+        ),
+    ),
+    texts=ClubTexts(
+        book_list_header="Что мы уже прочитали",
+        num_meetings="Количество проведённых встреч",
+        num_books="Прочитано",
+        num_pages="Примерное количество прочитанных страниц",
+        num_sentences="Примерное количество прочитанных предложений",
+        num_words="Примерное количество прочитанных слов",
+        thickest_books="Самые толстые прочитанные книги",
+        thickest_book="Самая толстая прочитанная книга",
+        thinnest_books="Самые тонкие прочитанные книги",
+        thinnest_book="Самая тонкая прочитанная книга",
+        authors_header="Количество прочитанных книг каждого автора",
+        pages_per_month_header="Количество страниц, читаемых в месяц",
+        pages_hist_caption="Книги какой толщины мы читаем больше всего / меньше всего.",
+    ),
+)
+
+BOOHEDONISTS_CONFIG = ClubConfig(
+    slug="boohedonists",
+    title="Книггедонисты📚",
+    data_file_path="boohedonists_files/boohedonists_book_list.xlsx",
+    date_columns=("voting_year", "voting_month", "voting_day"),
+    reviews_file_path="boohedonists_files/boohedonists_reviews.json",
+    texts=ClubTexts(
+        book_list_header="Что мы уже выбирали для чтения",
+        num_meetings="Количество проведённых голосований за книги",
+        num_books="Выбрано для чтения",
+        num_pages="Примерное количество страниц в выбранных книгах",
+        num_sentences="Примерное количество предложений в выбранных книгах",
+        num_words="Примерное количество слов в выбранных книгах",
+        thickest_books="Самые толстые выбранные книги",
+        thickest_book="Самая толстая выбранная книга",
+        thinnest_books="Самые тонкие выбранные книги",
+        thinnest_book="Самая тонкая выбранная книга",
+        authors_header="Количество выбранных книг каждого автора",
+        pages_per_month_header="Количество страниц в выбранных книгах в месяц",
+        pages_hist_caption=(
+            "Книги какой толщины мы выбираем больше всего / меньше всего."
+        ),
+    ),
+)
+
+CLUB_CONFIGS = (CHITAEM_VMESTE_CONFIG, BOOHEDONISTS_CONFIG)
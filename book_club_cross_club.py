@@ -0,0 +1,217 @@
+"""
+Books of all clubs in one table.
+
+The ClubData of every club is renumbered and appended into a single
+ClubData with two more columns in books: club (categorical, in the order
+of the clubs) and book_key. Authors and genres of different clubs are
+matched by canonicalize_key of their names, so the codes of
+book_authors["author"] are the join index of authors across clubs; books
+are matched by book_key, the code of (title_key, first author).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from book_club_data import (
+    TITLE_KEY_COLUMN,
+    ClubData,
+    build_authors,
+    build_book_genres,
+    unify_spellings,
+)
+from book_club_viz_utils import ClubStats, compute_year_stats
+
+CLUB_COLUMN = "club"
+BOOK_KEY_COLUMN = "book_key"
+# у клубов разные названия столбцов даты (meeting_*, voting_*)
+DATE_COLUMNS = ["year", "month", "day"]
+
+
+def renumber_books(
+    table: pd.DataFrame, book_ids: pd.Index, first_book_id: int
+) -> pd.DataFrame:
+    """table with book_ids replaced by first_book_id, first_book_id + 1, ..."""
+    table = table.copy()
+    table["book_id"] = first_book_id + book_ids.get_indexer(target=table["book_id"])
+    return table
+
+
+def build_cross_club_data(
+    club_datas: dict[str, ClubData], date_columns_subsets: dict[str, list[str]]
+) -> ClubData:
+    """
+    Union of the books of all clubs (see the module docstring).
+
+    Parameters
+    ----------
+    club_datas : dict
+        ClubData of every club by club name.
+    date_columns_subsets : dict
+        Year, month and day columns of every club by club name; they are
+        renamed to DATE_COLUMNS.
+    """
+    books_parts = []
+    book_author_rows_parts = []
+    book_genres_parts = []
+    first_book_id = 0
+    for club_name, club_data in club_datas.items():
+        book_ids = pd.Index(data=club_data.books["book_id"])
+        books = renumber_books(
+            table=club_data.books, book_ids=book_ids, first_book_id=first_book_id
+        ).rename(columns=dict(zip(date_columns_subsets[club_name], DATE_COLUMNS)))
+        books.insert(loc=1, column=CLUB_COLUMN, value=club_name)
+        books_parts.append(books)
+        book_author_rows_parts.append(
+            renumber_books(
+                table=club_data.get_book_author_rows(),
+                book_ids=book_ids,
+                first_book_id=first_book_id,
+            )
+        )
+        book_genres_parts.append(
+            renumber_books(
+                table=club_data.book_genres,
+                book_ids=book_ids,
+                first_book_id=first_book_id,
+            )
+        )
+        first_book_id += club_data.num_books
+
+    books = pd.concat(books_parts, ignore_index=True)
+    books[CLUB_COLUMN] = pd.Categorical(
+        values=books[CLUB_COLUMN], categories=list(club_datas)
+    )
+    # страна и пол автора берутся из клуба, где он встретился первым: клубы
+    # могут записывать их по-разному
+    authors, book_authors = build_authors(
+        book_author_rows=unify_spellings(
+            table=pd.concat(book_author_rows_parts, ignore_index=True),
+            column_name="author",
+            value_columns=("author_country", "author_gender"),
+        )
+    )
+    book_genres = build_book_genres(
+        book_genre_rows=pd.concat(book_genres_parts, ignore_index=True)
+    )
+
+    title_codes, _ = pd.factorize(values=books[TITLE_KEY_COLUMN])
+    first_author_codes = (
+        book_authors.drop_duplicates(subset="book_id")
+        .set_index("book_id")["author"]
+        .cat.codes.reindex(books["book_id"], fill_value=-1)
+        .to_numpy()
+    )
+    books[BOOK_KEY_COLUMN], _ = pd.factorize(
+        values=title_codes * (len(authors) + 1) + first_author_codes + 1
+    )
+
+    return ClubData(
+        books=books,
+        authors=authors,
+        book_authors=book_authors,
+        book_genres=book_genres,
+    )
+
+
+def count_by_club(
+    keys: np.ndarray, club_codes: np.ndarray, num_keys: int, num_clubs: int
+) -> np.ndarray:
+    """Matrix num_keys x num_clubs of the numbers of (key, club) pairs."""
+    # коды Categorical бывают int8, произведение считается в int64
+    return np.bincount(
+        keys.astype(np.int64) * num_clubs + club_codes, minlength=num_keys * num_clubs
+    ).reshape(num_keys, num_clubs)
+
+
+def get_shared_table(
+    counts: np.ndarray, index: pd.Index, club_names: list[str]
+) -> pd.DataFrame:
+    """
+    Rows of counts (key x club) present in two or more clubs, by descending
+    number of clubs and then of books.
+    """
+    num_clubs = (counts > 0).sum(axis=1)
+    is_shared = num_clubs > 1
+    shared_table = pd.DataFrame(
+        data=counts[is_shared], index=index[is_shared], columns=club_names
+    )
+    order = np.lexsort(keys=(-counts[is_shared].sum(axis=1), -num_clubs[is_shared]))
+    return shared_table.iloc[order]
+
+
+@dataclass
+class CrossClubStats:
+    """
+    Statistics of all clubs together.
+
+    club_stats are the usual statistics of the union of the book lists;
+    club_overlap is the clubs x clubs table of the numbers of common books
+    (the diagonal is the number of different books of a club);
+    shared_books and shared_authors are the books and the authors chosen by
+    two or more clubs with the numbers of books of every club.
+    """
+
+    club_stats: ClubStats
+    num_books_uniq: int
+    club_overlap: pd.DataFrame
+    shared_books: pd.DataFrame
+    shared_authors: pd.DataFrame
+
+
+def compute_cross_club_stats(cross_club_data: ClubData) -> CrossClubStats:
+    books = cross_club_data.books
+    book_authors = cross_club_data.book_authors
+    club_names = books[CLUB_COLUMN].cat.categories.to_list()
+    # book_id совпадает с номером строки books
+    club_codes = books[CLUB_COLUMN].cat.codes.to_numpy()
+
+    book_keys = books[BOOK_KEY_COLUMN].to_numpy()
+    num_books_uniq = book_keys.max() + 1 if len(book_keys) else 0
+    book_counts = count_by_club(
+        keys=book_keys,
+        club_codes=club_codes,
+        num_keys=num_books_uniq,
+        num_clubs=len(club_names),
+    )
+    has_book = (book_counts > 0).astype(np.int64)
+
+    first_positions = pd.Series(data=book_keys).drop_duplicates().sort_values()
+    first_books = books.iloc[first_positions.index]
+    first_book_authors = (
+        book_authors.drop_duplicates(subset="book_id")
+        .set_index("book_id")["author"]
+        .reindex(first_books["book_id"])
+    )
+    book_index = pd.MultiIndex.from_arrays(
+        arrays=[first_book_authors.astype(str).to_numpy(), first_books["title"]],
+        names=["author", "title"],
+    )
+
+    author_counts = count_by_club(
+        keys=book_authors["author"].cat.codes.to_numpy(),
+        club_codes=club_codes[book_authors["book_id"].to_numpy()],
+        num_keys=len(cross_club_data.authors),
+        num_clubs=len(club_names),
+    )
+
+    return CrossClubStats(
+        club_stats=compute_year_stats(
+            club_data=cross_club_data, date_columns_subset=DATE_COLUMNS
+        ),
+        num_books_uniq=int(num_books_uniq),
+        club_overlap=pd.DataFrame(
+            data=has_book.T @ has_book, index=club_names, columns=club_names
+        ),
+        shared_books=get_shared_table(
+            counts=book_counts, index=book_index, club_names=club_names
+        ),
+        shared_authors=get_shared_table(
+            counts=author_counts,
+            index=pd.Index(
+                data=cross_club_data.authors["author"].astype(str), name="author"
+            ),
+            club_names=club_names,
+        ),
+    )
@@ -0,0 +1,449 @@
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+from book_club_charts import show_figures, show_section
+from book_club_reviews import get_review_store, show_reviews
+from book_club_stats import (
+    get_cross_club_stats,
+    get_data_file_hash,
+    get_data_file_version,
+    get_stats_table,
+)
+from book_club_viz_utils import (
+    AVG_NUM_WORDS_PER_PAGE,
+    AVG_NUM_WORDS_PER_SENTENCE,
+    BOOK_TABLE_PAGE_SIZE,
+    PAPER_THICKNESS_IN_METERS,
+    ClubStats,
+    get_authors_inflection,
+    get_book_table_page,
+    get_books_inflection,
+    get_genres_inflection,
+    get_num_table_pages,
+)
+
+# годы без разделителя тысяч (1,984 -> 1984)
+BOOK_TABLE_COLUMN_CONFIG = {
+    "year_written_or_published": st.column_config.NumberColumn(format="%d")
+}
+
+
+@dataclass(frozen=True)
+class ClubTexts:
+    """Wording that differs between clubs (e.g. "прочитанные" vs "выбранные")."""
+
+    book_list_header: str
+    num_meetings: str
+    num_books: str
+    num_pages: str
+    num_sentences: str
+    num_words: str
+    thickest_books: str
+    thickest_book: str
+    thinnest_books: str
+    thinnest_book: str
+    authors_header: str
+    pages_per_month_header: str
+    pages_hist_caption: str
+
+
+@dataclass(frozen=True)
+class ClubConfig:
+    """
+    Everything the dashboard needs to know about a club.
+
+    slug is a short unique name used in widget keys and page URLs;
+    date_columns are the year, month and day columns of the book list.
+    """
+
+    slug: str
+    title: str
+    data_file_path: str
+    date_columns: tuple[str, str, str]
+    texts: ClubTexts
+    intro: tuple[str, ...] = ()
+    links: tuple[str, ...] = ()
+    reviews_file_path: str | None = None
+
+
+def get_extreme_books_msg(
+    pages_rows: pd.DataFrame, msg_plural: str, msg_single: str
+) -> str:
+    if pages_rows.shape[0] > 1:
+        msg = f"{msg_plural}: "
+    else:
+        msg = f"{msg_single}: "
+    for row in pages_rows.itertuples():
+        msg += f"**{row.author[1:-1]} *{row.title}*** ({row.num_pages} стр.), "
+    return msg[:-2] + "."
+
+
+def get_most_popular_msg(
+    most_popular: list[tuple[str, int]], msg_plural: str, msg_single: str
+) -> str:
+    if len(most_popular) > 1:
+        msg = f"{msg_plural}: "
+    else:
+        msg = f"{msg_single}: "
+    for value, freq in most_popular:
+        msg += f"**{value}** ({freq} кн.), "
+    return msg[:-2] + "."
+
+
+def get_freq_list_msg(values_by_freq: list[tuple[str, int]], unit: str) -> str:
+    freq_sum = sum(item[1] for item in values_by_freq)
+    msg = ""
+    for value, freq in values_by_freq:
+        msg += f"- {value}: {freq} {unit} ({freq / freq_sum * 100:.1f}%)\n"
+    return msg
+
+
+def show_freq_list(values_by_freq: list[tuple[str, int]], unit: str) -> None:
+    st.write(get_freq_list_msg(values_by_freq=values_by_freq, unit=unit))
+
+
+def get_general_stats_msgs(year_stats: ClubStats, texts: ClubTexts) -> list[str]:
+    """Markdown paragraphs of the "Общая статистика" section."""
+    num_books = year_stats.num_books
+    books_inflection_str = get_books_inflection(num_books=num_books)
+
+    num_authors_uniq = year_stats.num_authors_uniq
+    author_inflection_str = get_authors_inflection(num_authors=num_authors_uniq)
+
+    num_genres_uniq = year_stats.num_genres_uniq
+    genre_inflection = get_genres_inflection(num_genres=num_genres_uniq)
+
+    num_pages_total_str = f"{year_stats.num_pages_total:_.0f}".replace("_", " ")
+    pages_height_str = f"{year_stats.pages_height_in_meters:.2f}".replace(".", ",")
+    num_words_str = f"{year_stats.num_words:_.0f}".replace("_", " ")
+    num_sentences_str = f"{year_stats.num_sentences:_.0f}".replace("_", " ")
+
+    return [
+        f"{texts.num_meetings}: **{year_stats.num_meetings}**.",
+        (
+            f"{texts.num_books}: **{num_books}** {books_inflection_str} "
+            f"**{num_authors_uniq}** {author_inflection_str} "
+            f"в **{num_genres_uniq}** {genre_inflection}."
+        ),
+        (
+            f"{texts.num_pages}: **{num_pages_total_str}**. "
+            "Если сложить столько страниц в одну стопку, "
+            f"то её высота составит, примерно, **{pages_height_str} м.** "
+            "(Из расчёта, что толщина одной страницы составляет "
+            f"{PAPER_THICKNESS_IN_METERS * 1_000} мм.)"
+        ),
+        (
+            f"{texts.num_sentences}: **{num_sentences_str}**. "
+            f"(Из расчёта {AVG_NUM_WORDS_PER_SENTENCE} слов на предложение)"
+        ),
+        (
+            f"{texts.num_words}: **{num_words_str}**. "
+            f"(Из расчёта {AVG_NUM_WORDS_PER_PAGE} слов на страницу): "
+        ),
+        get_extreme_books_msg(
+            pages_rows=year_stats.thickest_books,
+            msg_plural=texts.thickest_books,
+            msg_single=texts.thickest_book,
+        ),
+        get_extreme_books_msg(
+            pages_rows=year_stats.thinnest_books,
+            msg_plural=texts.thinnest_books,
+            msg_single=texts.thinnest_book,
+        ),
+        get_most_popular_msg(
+            most_popular=year_stats.most_popular_genres,
+            msg_plural="Самые популярные жанры",
+            msg_single="Самый популярный жанр",
+        ),
+        get_most_popular_msg(
+            most_popular=year_stats.most_popular_authors,
+            msg_plural="Самые популярные авторы",
+            msg_single="Самый популярный автор",
+        ),
+        get_most_popular_msg(
+            most_popular=year_stats.most_popular_countries,
+            msg_plural="Самые популярные страны",
+            msg_single="Самая популярная страна",
+        ),
+    ]
+
+
+def show_general_stats(year_stats: ClubStats, texts: ClubTexts) -> None:
+    for msg in get_general_stats_msgs(year_stats=year_stats, texts=texts):
+        st.write(msg)
+
+
+# фрагмент: переход по страницам таблицы перезапускает только таблицу
+@st.fragment
+def show_book_table(books_df: pd.DataFrame, key: str) -> None:
+    """
+    Show the book table one page at a time: only the rows of the current
+    page are sent to the browser.
+    """
+    num_pages = get_num_table_pages(num_rows=len(books_df))
+    page_number = 1
+    if num_pages > 1:
+        page_number = st.number_input(
+            label=f"Страница (из {num_pages}, по {BOOK_TABLE_PAGE_SIZE} книг)",
+            min_value=1,
+            max_value=num_pages,
+            step=1,
+            key=key,
+        )
+    st.dataframe(
+        data=get_book_table_page(books_df=books_df, page_number=page_number),
+        column_config=BOOK_TABLE_COLUMN_CONFIG,
+    )
+
+
+# фрагмент: переключатель раздела перезапускает только разделы, а не всю
+# страницу с таблицей и общей статистикой
+@st.fragment
+def show_stats_sections(
+    config: ClubConfig,
+    year_stats: ClubStats,
+    year_chosen_str: str,
+    data_file_hash: str,
+) -> None:
+    texts = config.texts
+    # графики открытых разделов сначала получают место на странице, а
+    # строятся в конце все вместе, параллельно
+    figure_placeholders: dict[str, DeltaGenerator] = {}
+
+    def show_club_figure(chart_kind: str) -> None:
+        figure_placeholders[chart_kind] = st.empty()
+
+    def show_club_section(title: str, anchor: str) -> bool:
+        return show_section(title=title, anchor=anchor, key=f"{config.slug}_{anchor}")
+
+    if show_club_section(
+        title=f"{texts.authors_header} (за {year_chosen_str})", anchor="autors"
+    ):
+        show_club_figure(chart_kind="authors")
+
+    if show_club_section(
+        title=f"Количество книг по странам (за {year_chosen_str})",
+        anchor="books_by_countries",
+    ):
+        col_countries_1, col_countries_2 = st.columns(spec=(0.7, 0.3))
+        with col_countries_1:
+            show_club_figure(chart_kind="book_countries")
+        with col_countries_2:
+            show_freq_list(values_by_freq=year_stats.book_countries_by_freq, unit="кн.")
+
+    if show_club_section(
+        title=f"Количество авторов по странам (за {year_chosen_str})",
+        anchor="countries",
+    ):
+        col_countries_1, col_countries_2 = st.columns(spec=(0.7, 0.3))
+        with col_countries_1:
+            show_club_figure(chart_kind="author_countries")
+        with col_countries_2:
+            show_freq_list(
+                values_by_freq=year_stats.author_countries_by_freq, unit="ав."
+            )
+
+    if show_club_section(title="Количество авторов по полу", anchor="gender"):
+        col_genders_1, col_genders_2 = st.columns(spec=(0.5, 0.5))
+        with col_genders_1:
+            show_club_figure(chart_kind="author_genders_bar")
+        with col_genders_2:
+            show_club_figure(chart_kind="author_genders_pie")
+
+    if show_club_section(
+        title=(f"Распределение книг по годам написания/издания (за {year_chosen_str})"),
+        anchor="years",
+    ):
+        show_club_figure(chart_kind="decades")
+
+    if show_club_section(
+        title=f"Количество книг по жанрам (за {year_chosen_str})", anchor="genres"
+    ):
+        col_genres_1, col_genres_2 = st.columns(spec=(0.7, 0.3))
+        with col_genres_1:
+            show_club_figure(chart_kind="genres")
+        with col_genres_2:
+            show_freq_list(values_by_freq=year_stats.genres_by_freq, unit="кн.")
+
+    if show_club_section(
+        title=f"{texts.pages_per_month_header} (за {year_chosen_str})",
+        anchor="pages_per_month",
+    ):
+        show_club_figure(chart_kind="pages_per_month")
+
+    # гистограмма толщины книг
+    if show_club_section(
+        title=(
+            "Распределение (гистограмма) количества страниц в книгах "
+            f"(за {year_chosen_str})"
+        ),
+        anchor="pages",
+    ):
+        st.write(texts.pages_hist_caption)
+        show_club_figure(chart_kind="pages_hist")
+
+    show_figures(
+        figure_placeholders=figure_placeholders,
+        year_stats=year_stats,
+        year_filter=year_chosen_str,
+        data_file_hash=data_file_hash,
+    )
+
+
+def show_book_stats(config: ClubConfig) -> None:
+    data_file_path = config.data_file_path
+    data_file_version = get_data_file_version(data_file_path=data_file_path)
+    stats_table = get_stats_table(
+        data_file_path=data_file_path,
+        date_columns_subset=config.date_columns,
+        data_file_version=data_file_version,
+    )
+    data_file_hash = get_data_file_hash(
+        data_file_path=data_file_path, data_file_version=data_file_version
+    )
+
+    year_options = list(stats_table)
+    year_chosen_str = st.selectbox(
+        label="Выберите год:",
+        options=year_options,
+        placeholder=year_options[0],
+        help="Выберите год, за который хотите посмотреть статистику",
+        key=f"{config.slug}_year",
+    )
+    if year_chosen_str is None:
+        year_chosen_str = year_options[0]
+    year_stats = stats_table[year_chosen_str]
+
+    st.header(
+        body=f"{config.texts.book_list_header} (за {year_chosen_str})",
+        anchor="book_list",
+        divider=True,
+    )
+    # таблица заполняется после общей статистики: текст дешёвый и должен
+    # появиться сразу
+    book_list_placeholder = st.empty()
+
+    st.header(
+        body=f"Общая статистика (за {year_chosen_str})",
+        anchor="general_stats",
+        divider=True,
+    )
+
+    show_general_stats(year_stats=year_stats, texts=config.texts)
+
+    with book_list_placeholder.container():
+        show_book_table(
+            books_df=year_stats.books_df,
+            key=f"{config.slug}_book_list_page_{year_chosen_str}",
+        )
+
+    show_stats_sections(
+        config=config,
+        year_stats=year_stats,
+        year_chosen_str=year_chosen_str,
+        data_file_hash=data_file_hash,
+    )
+
+
+def show_dashboard(config: ClubConfig) -> None:
+    st.title(body=config.title)
+
+    for line in config.intro:
+        st.write(line)
+
+    if config.links:
+        st.header(body="Наши ссылки", anchor="links", divider=True)
+        for link in config.links:
+            st.write(link)
+        st.divider()
+
+    if config.reviews_file_path is None:
+        show_book_stats(config=config)
+        return
+
+    tab_with_book_stats, tab_with_reviews = st.tabs(
+        ["Статистика по книгам", "Отзывы на книги"]
+    )
+    with tab_with_book_stats:
+        show_book_stats(config=config)
+    with tab_with_reviews:
+        review_store = get_review_store(
+            reviews_file_path=config.reviews_file_path,
+            reviews_file_version=get_data_file_version(
+                data_file_path=config.reviews_file_path
+            ),
+        )
+        show_reviews(review_store=review_store, key_prefix=f"{config.slug}_reviews")
+
+
+def show_cross_club_dashboard(configs: tuple[ClubConfig, ...]) -> None:
+    """Shared books and authors and the combined statistics of all clubs."""
+    st.title(body="Все клубы вместе")
+
+    data_file_versions = tuple(
+        get_data_file_version(data_file_path=config.data_file_path)
+        for config in configs
+    )
+    cross_club_stats = get_cross_club_stats(
+        club_names=tuple(config.title for config in configs),
+        data_file_paths=tuple(config.data_file_path for config in configs),
+        date_columns_subsets=tuple(config.date_columns for config in configs),
+        data_file_versions=data_file_versions,
+    )
+    data_file_hash = "-".join(
+        get_data_file_hash(
+            data_file_path=config.data_file_path, data_file_version=data_file_version
+        )
+        for config, data_file_version in zip(configs, data_file_versions)
+    )
+    club_stats = cross_club_stats.club_stats
+
+    st.write(
+        f"Клубов: **{len(configs)}**. Всего выбрано книг: **{club_stats.num_books}**, "
+        f"из них разных: **{cross_club_stats.num_books_uniq}**. "
+        f"Авторов: **{club_stats.num_authors_uniq}**."
+    )
+
+    st.header(body="Общие книги", anchor="shared_books", divider=True)
+    st.write(
+        "Количество одинаковых книг у каждой пары клубов "
+        "(на диагонали - количество разных книг клуба):"
+    )
+    st.dataframe(data=cross_club_stats.club_overlap)
+    st.write("Книги, которые выбирали несколько клубов:")
+    st.dataframe(data=cross_club_stats.shared_books)
+
+    st.header(body="Общие авторы", anchor="shared_authors", divider=True)
+    st.write("Количество книг авторов, которых выбирали несколько клубов:")
+    st.dataframe(data=cross_club_stats.shared_authors)
+
+    figure_placeholders: dict[str, DeltaGenerator] = {}
+    if show_section(
+        title="Количество книг по жанрам", anchor="genres", key="all_genres"
+    ):
+        col_genres_1, col_genres_2 = st.columns(spec=(0.7, 0.3))
+        with col_genres_1:
+            figure_placeholders["genres"] = st.empty()
+        with col_genres_2:
+            show_freq_list(values_by_freq=club_stats.genres_by_freq, unit="кн.")
+
+    if show_section(
+        title="Количество авторов по странам", anchor="countries", key="all_countries"
+    ):
+        col_countries_1, col_countries_2 = st.columns(spec=(0.7, 0.3))
+        with col_countries_1:
+            figure_placeholders["author_countries"] = st.empty()
+        with col_countries_2:
+            show_freq_list(
+                values_by_freq=club_stats.author_countries_by_freq, unit="ав."
+            )
+
+    show_figures(
+        figure_placeholders=figure_placeholders,
+        year_stats=club_stats,
+        year_filter="все клубы",
+        data_file_hash=data_file_hash,
+    )
@@ -0,0 +1,452 @@
+import errno
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import unicodedata
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# столбцы, значения которых хранятся в xlsx строками вида "[a, b, c]"
+AUTHOR_COLUMNS = ["author", "author_country", "author_gender"]
+GENRE_COLUMN = "genres"
+# столбцы-измерения хранятся как pandas Categorical: каждое значение
+# (автор, страна, ...) хранится один раз в categories, а в строках - его
+# целочисленный код
+DIMENSION_COLUMNS = {
+    "authors": AUTHOR_COLUMNS,
+    "book_authors": ["author"],
+    "book_genres": ["genre"],
+}
+
+YEAR_COLUMN = "year_written_or_published"
+# канонический ключ названия: по нему, а не по строке title, ищутся повторы
+TITLE_KEY_COLUMN = "title_key"
+QUOTE_PATTERN = re.compile(r"[«»„“”‟\"']")
+
+SNAPSHOT_DIR_NAME = ".snapshot"
+SNAPSHOT_MANIFEST_NAME = "source.json"
+# меняется вместе со структурой таблиц: снимки старого формата перестраиваются
+SNAPSHOT_FORMAT = 4
+TABLE_NAMES = ("books", "authors", "book_authors", "book_genres")
+# ошибки записи, при которых снимок не пишется вовсе: папка с данными
+# смонтирована только для чтения или недоступна процессу
+READ_ONLY_ERRNOS = (errno.EROFS, errno.EACCES, errno.EPERM)
+
+# снимок одной папки строит один поток: страница клуба и сводка по всем
+# клубам кэшируются разными функциями и загружают один xlsx одновременно
+SNAPSHOT_LOCKS: dict[Path, threading.Lock] = {}
+SNAPSHOT_LOCKS_LOCK = threading.Lock()
+
+
+@dataclass
+class ClubData:
+    """
+    Normalized book list of a club.
+
+    books - one row per book (the xlsx columns plus book_id and title_key,
+    the canonicalize_key of the title);
+    authors - one row per distinct author (author, author_country,
+    author_gender), the row number is the code of the author in
+    book_authors["author"];
+    book_authors - one row per book-author pair (book_id, author);
+    book_genres - one row per book-genre pair (book_id, genre).
+    """
+
+    books: pd.DataFrame
+    authors: pd.DataFrame
+    book_authors: pd.DataFrame
+    book_genres: pd.DataFrame
+
+    @property
+    def num_books(self) -> int:
+        return len(self.books)
+
+    def get_author_attribute(self, column_name: str) -> pd.Series:
+        """author_country or author_gender of every row of book_authors."""
+        author_codes = self.book_authors["author"].cat.codes.to_numpy()
+        return pd.Series(
+            data=self.authors[column_name].array.take(author_codes),
+            index=self.book_authors.index,
+            name=column_name,
+        )
+
+    def get_book_authors_uniq(self) -> pd.DataFrame:
+        """Rows of authors of book_authors, in order of first appearance."""
+        author_codes = self.book_authors["author"].cat.codes.to_numpy()
+        return self.authors.take(pd.unique(author_codes))
+
+    def get_book_author_rows(self) -> pd.DataFrame:
+        """book_authors with the author attributes (as in the xlsx)."""
+        book_author_rows = self.book_authors.copy()
+        for column_name in ("author_country", "author_gender"):
+            book_author_rows[column_name] = self.get_author_attribute(
+                column_name=column_name
+            )
+        return book_author_rows
+
+    def append(self, other: "ClubData") -> "ClubData":
+        """Tables with the books of other (with book_ids after ours) appended."""
+        # у Categorical с разными categories concat даёт object, поэтому
+        # измерения собираются заново
+        authors, book_authors = build_authors(
+            book_author_rows=pd.concat(
+                [self.get_book_author_rows(), other.get_book_author_rows()],
+                ignore_index=True,
+            )
+        )
+        return ClubData(
+            books=pd.concat([self.books, other.books], ignore_index=True),
+            authors=authors,
+            book_authors=book_authors,
+            book_genres=build_book_genres(
+                book_genre_rows=pd.concat(
+                    [self.book_genres, other.book_genres], ignore_index=True
+                )
+            ),
+        )
+
+    def select_books(self, book_ids: pd.Series) -> "ClubData":
+        # authors - справочник, он не фильтруется
+        return ClubData(
+            books=self.books[self.books["book_id"].isin(book_ids)],
+            authors=self.authors,
+            book_authors=self.book_authors[self.book_authors["book_id"].isin(book_ids)],
+            book_genres=self.book_genres[self.book_genres["book_id"].isin(book_ids)],
+        )
+
+
+def intern_columns(table: pd.DataFrame, column_names: list[str]) -> pd.DataFrame:
+    return table.astype(dtype={column_name: "category" for column_name in column_names})
+
+
+def build_authors(book_author_rows: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split (book_id, author, author_country, author_gender) rows into the
+    authors dimension and the (book_id, author) book_authors table.
+
+    If an author has different countries or genders in different books,
+    the values of the first book are kept and a warning is logged. Spellings
+    of a value with the same canonicalize_key ("Лев Толстой", "Лев  Толстой")
+    are replaced with the first one.
+    """
+    for column_name in AUTHOR_COLUMNS:
+        book_author_rows = unify_spellings(
+            table=book_author_rows, column_name=column_name
+        )
+    num_values = book_author_rows.groupby(by="author", observed=True)[
+        ["author_country", "author_gender"]
+    ].nunique()
+    is_conflicting = (num_values > 1).any(axis=1)
+    # одна опечатка в xlsx не должна ронять страницу клуба: как и в сводке
+    # по всем клубам, остаются значения из первой книги автора
+    if is_conflicting.any():
+        logger.warning(
+            "authors have different author_country or author_gender in "
+            "different books, the values of the first book are used: %s",
+            num_values.index[is_conflicting].to_list(),
+        )
+
+    book_authors = intern_columns(
+        table=book_author_rows[["book_id", "author"]],
+        column_names=DIMENSION_COLUMNS["book_authors"],
+    )
+    authors = book_author_rows[AUTHOR_COLUMNS].drop_duplicates(subset="author")
+    authors = intern_columns(table=authors, column_names=DIMENSION_COLUMNS["authors"])
+    # строка автора совпадает с его кодом: categories у обоих столбцов author
+    # одинаковые, а сортировка Categorical идёт по кодам
+    authors = authors.sort_values(by="author", ignore_index=True)
+    return authors, book_authors
+
+
+def build_book_genres(book_genre_rows: pd.DataFrame) -> pd.DataFrame:
+    """(book_id, genre) rows with unified spellings and interned genres."""
+    return intern_columns(
+        table=unify_spellings(table=book_genre_rows, column_name="genre"),
+        column_names=DIMENSION_COLUMNS["book_genres"],
+    )
+
+
+def canonicalize_key(text: str) -> str:
+    """
+    Key to match free-text values (titles, authors, genres) by: NFKC
+    normalized, lower case, ё folded to е, without quotes, with single
+    spaces. "«Мёртвые  души»" and '"Мертвые души"' get the same key.
+    """
+    text = unicodedata.normalize("NFKC", text).lower().replace("ё", "е")
+    return " ".join(QUOTE_PATTERN.sub("", text).split())
+
+
+def normalize_keys(values: pd.Series) -> pd.Series:
+    """canonicalize_key of a column; every distinct value is normalized once."""
+    codes, uniques = pd.factorize(values=values)
+    keys = np.array([canonicalize_key(text=str(value)) for value in uniques])
+    return pd.Series(data=keys[codes], index=values.index, name=values.name)
+
+
+def unify_spellings(
+    table: pd.DataFrame, column_name: str, value_columns: tuple[str, ...] = ()
+) -> pd.DataFrame:
+    """
+    Replace column_name and value_columns of every row with the values of
+    the first row with the same canonicalize_key of column_name.
+    """
+    key_codes, _ = pd.factorize(values=normalize_keys(values=table[column_name]))
+    # коды выдаются в порядке первого появления ключа
+    first_positions = pd.Series(data=key_codes).drop_duplicates().index.to_numpy()
+    source_positions = first_positions[key_codes]
+    unified = table.copy()
+    for name in (column_name, *value_columns):
+        unified[name] = table[name].array.take(source_positions)
+    return unified
+
+
+def split_list_column(values: pd.Series) -> pd.Series:
+    """Vectorized parse_string_into_list for a whole column."""
+    return values.str.slice(start=1, stop=-1).str.split(pat=", ")
+
+
+def ingest_book_list(books_df: pd.DataFrame, first_book_id: int = 0) -> ClubData:
+    books = books_df.reset_index(drop=True)
+    books.insert(
+        loc=0,
+        column="book_id",
+        value=range(first_book_id, first_book_id + len(books)),
+    )
+    # годы - целые числа, чтобы таблица книг не показывала их как 1,984.0;
+    # Int64, а не int64: у старых и недатированных книг год не заполнен
+    books[YEAR_COLUMN] = books[YEAR_COLUMN].astype("Int64")
+    books[TITLE_KEY_COLUMN] = normalize_keys(values=books["title"])
+
+    book_authors = books[["book_id"] + AUTHOR_COLUMNS].copy()
+    for column_name in AUTHOR_COLUMNS:
+        book_authors[column_name] = split_list_column(values=book_authors[column_name])
+    num_authors = book_authors["author"].str.len()
+    misaligned = (book_authors["author_country"].str.len() != num_authors) | (
+        book_authors["author_gender"].str.len() != num_authors
+    )
+    # как и при расхождении стран и полов автора, опечатка в одной строке
+    # xlsx не роняет страницу клуба: у такой книги просто не будет авторов
+    if misaligned.any():
+        logger.warning(
+            "author, author_country and author_gender have different lengths, "
+            "the authors of these books are skipped: %s",
+            books.loc[misaligned, "title"].to_list(),
+        )
+        book_authors = book_authors[~misaligned]
+    book_authors = book_authors.explode(column=AUTHOR_COLUMNS, ignore_index=True)
+    for column_name in AUTHOR_COLUMNS:
+        book_authors[column_name] = book_authors[column_name].str.strip()
+    authors, book_authors = build_authors(book_author_rows=book_authors)
+
+    book_genres = books[["book_id", GENRE_COLUMN]].copy()
+    book_genres[GENRE_COLUMN] = split_list_column(values=book_genres[GENRE_COLUMN])
+    book_genres = book_genres.explode(column=GENRE_COLUMN, ignore_index=True)
+    book_genres = book_genres.rename(columns={GENRE_COLUMN: "genre"})
+    book_genres["genre"] = book_genres["genre"].str.strip()
+    book_genres = build_book_genres(book_genre_rows=book_genres)
+
+    return ClubData(
+        books=books,
+        authors=authors,
+        book_authors=book_authors,
+        book_genres=book_genres,
+    )
+
+
+def get_snapshot_dir(data_file_path: str) -> Path:
+    """
+    Directory with the Parquet tables of a data file, e.g.
+    chitaem_vmeste_files/.snapshot/chitaem_vmeste_book_list/
+    """
+    data_file = Path(data_file_path)
+    return data_file.parent / SNAPSHOT_DIR_NAME / data_file.stem
+
+
+def compute_file_hash(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compute_rows_hash(books_df: pd.DataFrame) -> str:
+    """Hash of the rows of the book list, independent of how the xlsx is zipped."""
+    row_hashes = pd.util.hash_pandas_object(obj=books_df, index=False)
+    return hashlib.sha256(row_hashes.to_numpy().tobytes()).hexdigest()
+
+
+def get_snapshot_lock(snapshot_dir: Path) -> threading.Lock:
+    with SNAPSHOT_LOCKS_LOCK:
+        return SNAPSHOT_LOCKS.setdefault(snapshot_dir, threading.Lock())
+
+
+def is_read_only_error(error: OSError) -> bool:
+    return error.errno in READ_ONLY_ERRNOS
+
+
+def replace_file(path: Path, write: Callable[[Path], object]) -> None:
+    """
+    Write the file with write(temporary path) and atomically replace path
+    with it, so that readers never see a partly written file. The temporary
+    file is unique per call, so concurrent writers do not share it.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp_path = Path(f.name)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_club_data(club_data: ClubData, snapshot_dir: Path) -> None:
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    for table_name in TABLE_NAMES:
+        table: pd.DataFrame = getattr(club_data, table_name)
+        replace_file(
+            path=snapshot_dir / f"{table_name}.parquet",
+            write=partial(table.to_parquet, index=False),
+        )
+
+
+def read_club_data(snapshot_dir: Path) -> ClubData:
+    tables = {
+        table_name: pd.read_parquet(path=snapshot_dir / f"{table_name}.parquet")
+        for table_name in TABLE_NAMES
+    }
+    return ClubData(**tables)
+
+
+def read_snapshot_manifest(snapshot_dir: Path) -> dict | None:
+    """
+    Describe the xlsx the snapshot was built from:
+    {"format": ..., "mtime": ..., "sha256": ..., "num_rows": ..., "rows_hash": ...}.
+    None if there is no snapshot yet or it has an old format.
+    """
+    try:
+        with open(snapshot_dir / SNAPSHOT_MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    return manifest if manifest.get("format") == SNAPSHOT_FORMAT else None
+
+
+def write_snapshot_manifest(snapshot_dir: Path, manifest: dict) -> None:
+    # манифест пишется последним: если запись таблиц оборвалась, снимок
+    # будет построен заново при следующей загрузке
+    replace_file(
+        path=snapshot_dir / SNAPSHOT_MANIFEST_NAME,
+        write=partial(Path.write_text, data=json.dumps(manifest), encoding="utf-8"),
+    )
+
+
+def is_appended(books_df: pd.DataFrame, manifest: dict | None) -> bool:
+    """True if books_df is the snapshot's book list with rows added at the end."""
+    if manifest is None or "num_rows" not in manifest:
+        return False
+    num_rows = manifest["num_rows"]
+    return len(books_df) > num_rows and (
+        compute_rows_hash(books_df=books_df.iloc[:num_rows]) == manifest["rows_hash"]
+    )
+
+
+def build_snapshot(data_file_path: str, manifest: dict | None = None) -> ClubData:
+    """
+    Parse the xlsx and save the normalized tables to Parquet.
+
+    If manifest describes the current snapshot and rows were only appended
+    to the xlsx since then, only the new rows are ingested and added to the
+    tables of the snapshot.
+    """
+    snapshot_dir = get_snapshot_dir(data_file_path=data_file_path)
+    data_file_mtime = os.path.getmtime(data_file_path)
+    data_file_hash = compute_file_hash(file_path=data_file_path)
+    books_df = pd.read_excel(io=data_file_path)
+    if is_appended(books_df=books_df, manifest=manifest):
+        club_data = read_club_data(snapshot_dir=snapshot_dir)
+        club_data = club_data.append(
+            ingest_book_list(
+                books_df=books_df.iloc[club_data.num_books :],
+                first_book_id=club_data.num_books,
+            )
+        )
+    else:
+        club_data = ingest_book_list(books_df=books_df)
+    write_club_data(club_data=club_data, snapshot_dir=snapshot_dir)
+    write_snapshot_manifest(
+        snapshot_dir=snapshot_dir,
+        manifest={
+            "format": SNAPSHOT_FORMAT,
+            "mtime": data_file_mtime,
+            "sha256": data_file_hash,
+            "num_rows": len(books_df),
+            "rows_hash": compute_rows_hash(books_df=books_df),
+        },
+    )
+    return club_data
+
+
+def load_club_data(data_file_path: str) -> ClubData:
+    """
+    Load the normalized tables of a club.
+
+    The xlsx is parsed only on the first load and after its content changes;
+    otherwise the tables are read from the Parquet snapshot. If only the
+    file's mtime changed, the snapshot is not rebuilt; if rows were appended
+    (a new meeting), only the new rows are ingested.
+    """
+    snapshot_dir = get_snapshot_dir(data_file_path=data_file_path)
+    data_file_mtime = os.path.getmtime(data_file_path)
+    manifest = read_snapshot_manifest(snapshot_dir=snapshot_dir)
+    if manifest is not None and manifest["mtime"] == data_file_mtime:
+        return read_club_data(snapshot_dir=snapshot_dir)
+
+    with get_snapshot_lock(snapshot_dir=snapshot_dir):
+        # пока ждали блокировку, снимок мог обновить другой поток
+        manifest = read_snapshot_manifest(snapshot_dir=snapshot_dir)
+        if manifest is not None and manifest["mtime"] == data_file_mtime:
+            return read_club_data(snapshot_dir=snapshot_dir)
+
+        data_file_hash = compute_file_hash(file_path=data_file_path)
+        if manifest is not None and manifest["sha256"] == data_file_hash:
+            try:
+                write_snapshot_manifest(
+                    snapshot_dir=snapshot_dir,
+                    manifest=manifest | {"mtime": data_file_mtime},
+                )
+            except OSError as error:
+                if not is_read_only_error(error=error):
+                    raise
+            return read_club_data(snapshot_dir=snapshot_dir)
+
+        try:
+            return build_snapshot(data_file_path=data_file_path, manifest=manifest)
+        except OSError as error:
+            if not is_read_only_error(error=error):
+                raise
+            logger.warning(
+                "cannot write the snapshot of %s (%s), parsing it without a snapshot",
+                data_file_path,
+                error,
+            )
+            return ingest_book_list(books_df=pd.read_excel(io=data_file_path))
+
+
+if __name__ == "__main__":
+    # python book_club_data.py path/to/book_list.xlsx [path/to/book_list.xlsx ...]
+    for data_file_path in sys.argv[1:]:
+        build_snapshot(data_file_path=data_file_path)
+        print(f"{data_file_path} -> {get_snapshot_dir(data_file_path=data_file_path)}")
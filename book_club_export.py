@@ -0,0 +1,271 @@
+"""
+Export the statistics pages of all clubs to a static site.
+
+    python book_club_export.py path/to/site [--workers 4]
+
+For every club and every year selector option an HTML page is written
+(site/<club>/<year>.html, site/<club>/index.html is the "все годы" page)
+together with its charts (site/<club>/<year>/<chart>.png). The charts are
+rendered in a process pool. The reviews tab is interactive and is not
+exported.
+"""
+
+import argparse
+import html
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from book_club_charts import get_chart_specs, render_chart
+from book_club_configs import CLUB_CONFIGS
+from book_club_dashboard import (
+    ClubConfig,
+    get_freq_list_msg,
+    get_general_stats_msgs,
+)
+from book_club_data import load_club_data
+from book_club_viz_utils import (
+    ALL_YEARS,
+    ClubStats,
+    compute_stats_table,
+    get_book_table_columns,
+)
+
+ALL_YEARS_PAGE_NAME = "index"
+
+MARKDOWN_EMPHASIS_PATTERN = re.compile(r"(\*{1,3})")
+URL_PATTERN = re.compile(r"(https?://[^\s<]+)")
+MARKDOWN_EMPHASIS_TAGS = {"*": ("i",), "**": ("b",), "***": ("b", "i")}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 960px; margin: 0 auto; padding: 1em; }}
+img {{ max-width: 100%; }}
+table {{ border-collapse: collapse; font-size: 0.9em; }}
+td, th {{ border: 1px solid #ddd; padding: 0.2em 0.4em; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def markdown_to_html(text: str) -> str:
+    """
+    Convert the markdown subset used in the app texts: **bold**, *italic*,
+    "- " list items and bare links.
+    """
+    lines = text.strip().split("\n")
+    if all(line.startswith("- ") for line in lines):
+        items = "".join(f"<li>{markdown_to_html(line[2:])}</li>" for line in lines)
+        return f"<ul>{items}</ul>"
+
+    open_tags: list[str] = []
+    html_parts: list[str] = []
+    for part in MARKDOWN_EMPHASIS_PATTERN.split(html.escape(text, quote=False)):
+        if part not in MARKDOWN_EMPHASIS_TAGS:
+            html_parts.append(URL_PATTERN.sub(r'<a href="\1">\1</a>', part))
+            continue
+        tags = MARKDOWN_EMPHASIS_TAGS[part]
+        # "***" в конце "**автор *название***" закрывает сначала курсив
+        tags_to_close = [tag for tag in reversed(open_tags) if tag in tags]
+        for tag in tags_to_close:
+            html_parts.append(f"</{tag}>")
+            open_tags.remove(tag)
+        for tag in tags:
+            if tag not in tags_to_close:
+                html_parts.append(f"<{tag}>")
+                open_tags.append(tag)
+    return "".join(html_parts)
+
+
+def get_page_name(year_option: str) -> str:
+    """Page file name of a year selector option, e.g. "2014 год" -> "2014"."""
+    return ALL_YEARS_PAGE_NAME if year_option == ALL_YEARS else year_option.split()[0]
+
+
+def get_sections(
+    config: ClubConfig, year_stats: ClubStats, year_option: str
+) -> list[tuple[str, str, list[str], str]]:
+    """
+    Sections of the page as (anchor, title, chart kinds, markdown text),
+    in the order of the app.
+    """
+    texts = config.texts
+    return [
+        ("autors", f"{texts.authors_header} (за {year_option})", ["authors"], ""),
+        (
+            "books_by_countries",
+            f"Количество книг по странам (за {year_option})",
+            ["book_countries"],
+            get_freq_list_msg(
+                values_by_freq=year_stats.book_countries_by_freq, unit="кн."
+            ),
+        ),
+        (
+            "countries",
+            f"Количество авторов по странам (за {year_option})",
+            ["author_countries"],
+            get_freq_list_msg(
+                values_by_freq=year_stats.author_countries_by_freq, unit="ав."
+            ),
+        ),
+        (
+            "gender",
+            "Количество авторов по полу",
+            ["author_genders_bar", "author_genders_pie"],
+            "",
+        ),
+        (
+            "years",
+            f"Распределение книг по годам написания/издания (за {year_option})",
+            ["decades"],
+            "",
+        ),
+        (
+            "genres",
+            f"Количество книг по жанрам (за {year_option})",
+            ["genres"],
+            get_freq_list_msg(values_by_freq=year_stats.genres_by_freq, unit="кн."),
+        ),
+        (
+            "pages_per_month",
+            f"{texts.pages_per_month_header} (за {year_option})",
+            ["pages_per_month"],
+            "",
+        ),
+        (
+            "pages",
+            (
+                "Распределение (гистограмма) количества страниц в книгах "
+                f"(за {year_option})"
+            ),
+            ["pages_hist"],
+            texts.pages_hist_caption,
+        ),
+    ]
+
+
+def build_year_page(
+    config: ClubConfig,
+    year_stats: ClubStats,
+    year_option: str,
+    year_options: list[str],
+) -> str:
+    page_name = get_page_name(year_option=year_option)
+    parts = [f"<h1>{html.escape(config.title)}</h1>"]
+    parts += [f"<p>{markdown_to_html(line)}</p>" for line in config.intro]
+    if config.links:
+        parts.append('<h2 id="links">Наши ссылки</h2>')
+        parts += [f"<p>{markdown_to_html(link)}</p>" for link in config.links]
+
+    year_links = [
+        f"<b>{html.escape(option)}</b>"
+        if option == year_option
+        else f'<a href="{get_page_name(year_option=option)}.html">'
+        f"{html.escape(option)}</a>"
+        for option in year_options
+    ]
+    parts.append(f"<p>Выберите год: {' | '.join(year_links)}</p>")
+
+    parts.append(
+        f'<h2 id="book_list">{html.escape(config.texts.book_list_header)} '
+        f"(за {html.escape(year_option)})</h2>"
+    )
+    books_df = year_stats.books_df
+    parts.append(
+        books_df[get_book_table_columns(books_df=books_df)].to_html(na_rep="", border=0)
+    )
+
+    parts.append(
+        f'<h2 id="general_stats">Общая статистика (за {html.escape(year_option)})</h2>'
+    )
+    parts += [
+        f"<p>{markdown_to_html(msg)}</p>"
+        for msg in get_general_stats_msgs(year_stats=year_stats, texts=config.texts)
+    ]
+
+    for anchor, title, chart_kinds, text in get_sections(
+        config=config, year_stats=year_stats, year_option=year_option
+    ):
+        parts.append(f'<h2 id="{anchor}">{html.escape(title)}</h2>')
+        if text:
+            parts.append(markdown_to_html(text))
+        parts += [
+            f'<img src="{page_name}/{chart_kind}.png" alt="{chart_kind}">'
+            for chart_kind in chart_kinds
+        ]
+
+    return PAGE_TEMPLATE.format(
+        title=html.escape(f"{config.title} (за {year_option})"), body="\n".join(parts)
+    )
+
+
+def export_club(
+    config: ClubConfig, site_dir: Path, executor: ProcessPoolExecutor
+) -> dict[Path, Future[bytes]]:
+    """Write the pages of the club and submit its charts to the executor."""
+    club_dir = site_dir / config.slug
+    stats_table = compute_stats_table(
+        club_data=load_club_data(data_file_path=config.data_file_path),
+        date_columns_subset=list(config.date_columns),
+    )
+    year_options = list(stats_table)
+    chart_futures: dict[Path, Future[bytes]] = {}
+    for year_option, year_stats in stats_table.items():
+        page_name = get_page_name(year_option=year_option)
+        (club_dir / page_name).mkdir(parents=True, exist_ok=True)
+        with open(club_dir / f"{page_name}.html", "w", encoding="utf-8") as f:
+            f.write(
+                build_year_page(
+                    config=config,
+                    year_stats=year_stats,
+                    year_option=year_option,
+                    year_options=year_options,
+                )
+            )
+        for chart_kind, chart_spec in get_chart_specs(year_stats=year_stats).items():
+            image_path = club_dir / page_name / f"{chart_kind}.png"
+            chart_futures[image_path] = executor.submit(render_chart, chart_spec)
+    return chart_futures
+
+
+def export_site(site_dir: Path, max_workers: int | None = None) -> None:
+    site_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chart_futures: dict[Path, Future[bytes]] = {}
+        for config in CLUB_CONFIGS:
+            chart_futures |= export_club(
+                config=config, site_dir=site_dir, executor=executor
+            )
+        for image_path, future in chart_futures.items():
+            image_path.write_bytes(future.result())
+
+    club_links = [
+        f'<li><a href="{config.slug}/{ALL_YEARS_PAGE_NAME}.html">'
+        f"{html.escape(config.title)}</a></li>"
+        for config in CLUB_CONFIGS
+    ]
+    with open(site_dir / "index.html", "w", encoding="utf-8") as f:
+        f.write(
+            PAGE_TEMPLATE.format(
+                title="Книжные клубы", body=f"<ul>{''.join(club_links)}</ul>"
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("site_dir", type=Path)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    export_site(site_dir=args.site_dir, max_workers=args.workers)
+    print(f"site -> {args.site_dir}")
@@ -0,0 +1,275 @@
+import bisect
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+
+import streamlit as st
+
+from book_club_data import canonicalize_key
+from book_club_stats import DATA_CACHE_MAX_ENTRIES
+
+REVIEW_BOOKS_PER_PAGE = 10
+
+BOOK_KEY = tuple[str, str]  # (book_author, book_title)
+
+SEARCH_FIELDS = ("review", "book_title", "book_author", "reviewer", "reviewer_alias")
+WORD_PATTERN = re.compile(r"\w+")
+# окончания, которые отбрасываются у слов запроса, чтобы "Оруэлла" находило
+# "Оруэлл", "Оруэллу" и т.д.; длинные окончания проверяются первыми
+RUSSIAN_ENDINGS = sorted(
+    (
+        "ами",
+        "ями",
+        "ого",
+        "его",
+        "ому",
+        "ему",
+        "ыми",
+        "ими",
+        "ах",
+        "ях",
+        "ов",
+        "ев",
+        "ей",
+        "ой",
+        "ий",
+        "ый",
+        "ая",
+        "яя",
+        "ое",
+        "ее",
+        "ом",
+        "ем",
+        "ую",
+        "юю",
+        "а",
+        "я",
+        "о",
+        "е",
+        "ы",
+        "и",
+        "у",
+        "ю",
+        "ь",
+    ),
+    key=len,
+    reverse=True,
+)
+MIN_STEM_LEN = 4
+MAX_CHAR = chr(sys.maxunicode)
+
+
+def tokenize(text: str) -> list[str]:
+    return WORD_PATTERN.findall(text.lower().replace("ё", "е"))
+
+
+def get_query_stem(token: str) -> str:
+    for ending in RUSSIAN_ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= MIN_STEM_LEN:
+            return token[: -len(ending)]
+    return token
+
+
+class ReviewSearchIndex:
+    """
+    Inverted index over the review text, book and reviewer fields.
+
+    A query matches the reviews containing, for every query word, a word
+    that starts with the stem of that query word.
+    """
+
+    def __init__(self, reviews: list[dict]) -> None:
+        self.postings: dict[str, set[int]] = {}
+        for review_pos, review in enumerate(reviews):
+            for field_name in SEARCH_FIELDS:
+                for token in tokenize(text=review.get(field_name, "")):
+                    self.postings.setdefault(token, set()).add(review_pos)
+        # отсортированный словарь: слова с общим префиксом идут подряд
+        self.vocabulary = sorted(self.postings)
+
+    def find_prefix(self, prefix: str) -> set[int]:
+        review_positions: set[int] = set()
+        # слова с префиксом prefix лежат в [prefix, prefix + максимальный символ)
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + MAX_CHAR, lo=start)
+        for token_pos in range(start, end):
+            review_positions |= self.postings[self.vocabulary[token_pos]]
+        return review_positions
+
+    def search(self, query: str) -> set[int]:
+        review_positions: set[int] | None = None
+        for token in tokenize(text=query):
+            token_positions = self.find_prefix(prefix=get_query_stem(token=token))
+            if review_positions is None:
+                review_positions = token_positions
+            else:
+                review_positions &= token_positions
+            if not review_positions:
+                break
+        return review_positions or set()
+
+
+def get_canonical_book_key(book_key: BOOK_KEY) -> BOOK_KEY:
+    book_author, book_title = book_key
+    return canonicalize_key(text=book_author), canonicalize_key(text=book_title)
+
+
+@dataclass
+class ReviewStore:
+    """
+    Reviews loaded once, plus an index of reviews by book.
+
+    book_keys keeps the books in order of their first review (as spelled
+    there); book_index maps the canonical key of a book (see
+    get_canonical_book_key) to the positions of its reviews in reviews, so
+    reviews of "«Мёртвые души»" and "Мертвые души" are of the same book.
+    canonical_book_keys maps every spelling met in the reviews to its
+    canonical key, so lookups do not canonicalize again.
+    """
+
+    reviews: list[dict]
+    book_keys: list[BOOK_KEY] = field(default_factory=list)
+    book_index: dict[BOOK_KEY, list[int]] = field(default_factory=dict)
+    canonical_book_keys: dict[BOOK_KEY, BOOK_KEY] = field(default_factory=dict)
+    search_index: ReviewSearchIndex = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.search_index = ReviewSearchIndex(reviews=self.reviews)
+        for review_pos, review in enumerate(self.reviews):
+            book_key = (review["book_author"], review["book_title"])
+            canonical_book_key = self.get_canonical_key(book_key=book_key)
+            if canonical_book_key not in self.book_index:
+                self.book_keys.append(book_key)
+                self.book_index[canonical_book_key] = []
+            self.book_index[canonical_book_key].append(review_pos)
+
+    def get_canonical_key(self, book_key: BOOK_KEY) -> BOOK_KEY:
+        """Canonical key of the book, computed once per spelling."""
+        canonical_book_key = self.canonical_book_keys.get(book_key)
+        if canonical_book_key is None:
+            canonical_book_key = get_canonical_book_key(book_key=book_key)
+            self.canonical_book_keys[book_key] = canonical_book_key
+        return canonical_book_key
+
+    @property
+    def num_books(self) -> int:
+        return len(self.book_keys)
+
+    def get_num_pages(
+        self,
+        books_per_page: int = REVIEW_BOOKS_PER_PAGE,
+        book_keys: list[BOOK_KEY] | None = None,
+    ) -> int:
+        num_books = self.num_books if book_keys is None else len(book_keys)
+        return max(1, -(-num_books // books_per_page))
+
+    def get_page(
+        self,
+        page: int,
+        books_per_page: int = REVIEW_BOOKS_PER_PAGE,
+        book_keys: list[BOOK_KEY] | None = None,
+    ) -> list[BOOK_KEY]:
+        """Books on the page (pages are numbered from 1)."""
+        if book_keys is None:
+            book_keys = self.book_keys
+        start = (page - 1) * books_per_page
+        return book_keys[start : start + books_per_page]
+
+    def get_reviews(
+        self, book_key: BOOK_KEY, review_positions: set[int] | None = None
+    ) -> list[dict]:
+        """Reviews of the book, optionally only those in review_positions."""
+        canonical_book_key = self.get_canonical_key(book_key=book_key)
+        return [
+            self.reviews[pos]
+            for pos in self.book_index.get(canonical_book_key, [])
+            if review_positions is None or pos in review_positions
+        ]
+
+    def search(self, query: str) -> tuple[list[BOOK_KEY], set[int]]:
+        """Books with matching reviews (in the usual order) and the reviews."""
+        review_positions = self.search_index.search(query=query)
+        book_keys = [
+            book_key
+            for book_key in self.book_keys
+            if not review_positions.isdisjoint(
+                self.book_index[self.canonical_book_keys[book_key]]
+            )
+        ]
+        return book_keys, review_positions
+
+
+def read_review_store(reviews_file_path: str) -> ReviewStore:
+    with open(reviews_file_path, "r", encoding="utf-8") as f:
+        return ReviewStore(reviews=json.load(f))
+
+
+# reviews_file_version (mtime файла) нужен только как часть ключа кэша
+@st.cache_resource(max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_review_store(
+    reviews_file_path: str, reviews_file_version: float
+) -> ReviewStore:
+    return read_review_store(reviews_file_path=reviews_file_path)
+
+
+def get_reviewer_name(review: dict) -> str:
+    return (
+        review["reviewer_alias"]
+        if review["reviewer_alias"] != ""
+        else review["reviewer"]
+    )
+
+
+@st.fragment
+def show_reviews(review_store: ReviewStore, key_prefix: str) -> None:
+    """
+    Render a paginated list of books with reviews.
+
+    The text of the reviews of a book is sent to the browser only after the
+    book's toggle is switched on. The list is a fragment: searching, paging
+    and toggling rerun only the list, not the statistics tab.
+    """
+    query = st.text_input(
+        label="Поиск по отзывам:",
+        placeholder="например, Оруэлл",
+        help="Ищет слова в тексте отзывов, названиях книг, авторах и рецензентах",
+        key=f"{key_prefix}_query",
+    )
+    book_keys: list[BOOK_KEY] | None = None
+    review_positions: set[int] | None = None
+    if query.strip():
+        book_keys, review_positions = review_store.search(query=query)
+        if not book_keys:
+            st.write("Ничего не найдено.")
+            return
+
+    num_pages = review_store.get_num_pages(book_keys=book_keys)
+    page = 1
+    if num_pages > 1:
+        page = st.number_input(
+            label=f"Страница (из {num_pages}):",
+            min_value=1,
+            max_value=num_pages,
+            value=1,
+            step=1,
+            key=f"{key_prefix}_page",
+        )
+
+    for book_author, book_title in review_store.get_page(
+        page=page, book_keys=book_keys
+    ):
+        book_key = (book_author, book_title)
+        book_reviews = review_store.get_reviews(
+            book_key=book_key, review_positions=review_positions
+        )
+        num_reviews = len(book_reviews)
+        if not st.toggle(
+            label=f"📖 **{book_author} *{book_title}*** ({num_reviews} отз.)",
+            key=f"{key_prefix}_{book_author}_{book_title}",
+        ):
+            continue
+        for review in book_reviews:
+            with st.chat_message(name="human"):
+                st.write(f"**{get_reviewer_name(review=review)}** ({review['date']}):")
+                st.write(review["review"])
@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from book_club_cross_club import (
+    CrossClubStats,
+    build_cross_club_data,
+    compute_cross_club_stats,
+)
+from book_club_data import ClubData, compute_file_hash, load_club_data
+from book_club_viz_utils import ClubStats, update_stats_table
+
+# кэши общие для всех клубов процесса: по записи на клуб и версию файла,
+# старые версии вытесняются после правки xlsx
+DATA_CACHE_MAX_ENTRIES = 8
+
+
+def get_data_file_version(data_file_path: str) -> float:
+    """Version of the data file, i.e. its last modification time."""
+    return os.path.getmtime(data_file_path)
+
+
+@st.cache_data(max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_data_file_hash(data_file_path: str, data_file_version: float) -> str:
+    """Hash of the data file content, recomputed only when the version changes."""
+    return compute_file_hash(file_path=data_file_path)
+
+
+@st.cache_resource
+def get_last_stats_tables() -> OrderedDict[
+    tuple, tuple[ClubData, dict[str, ClubStats]]
+]:
+    """
+    The latest stats tables of the DATA_CACHE_MAX_ENTRIES most recently used
+    data files with the data they were computed from, so that the next
+    version of a file can be computed incrementally.
+    """
+    return OrderedDict()
+
+
+# таблицы общие для всех сессий, а get_stats_table вызывается из их потоков
+LAST_STATS_TABLES_LOCK = threading.Lock()
+
+
+def get_last_stats_table(key: tuple) -> tuple[ClubData | None, dict[str, ClubStats]]:
+    last_stats_tables = get_last_stats_tables()
+    with LAST_STATS_TABLES_LOCK:
+        if key not in last_stats_tables:
+            return None, {}
+        last_stats_tables.move_to_end(key)
+        return last_stats_tables[key]
+
+
+def set_last_stats_table(
+    key: tuple, club_data: ClubData, stats_table: dict[str, ClubStats]
+) -> None:
+    last_stats_tables = get_last_stats_tables()
+    with LAST_STATS_TABLES_LOCK:
+        last_stats_tables[key] = (club_data, stats_table)
+        last_stats_tables.move_to_end(key)
+        while len(last_stats_tables) > DATA_CACHE_MAX_ENTRIES:
+            last_stats_tables.popitem(last=False)
+
+
+def is_prefix(club_data: ClubData, of_club_data: ClubData) -> bool:
+    num_books = club_data.num_books
+    return num_books <= of_club_data.num_books and club_data.books.equals(
+        of_club_data.books.iloc[:num_books]
+    )
+
+
+# cache_resource, а не cache_data: таблица только читается, поэтому все сессии
+# получают один и тот же объект без копирования через pickle на каждый rerun.
+# data_file_version входит в ключ кэша, чтобы после правки xlsx статистика
+# пересчиталась.
+@st.cache_resource(max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_stats_table(
+    data_file_path: str, date_columns_subset: tuple[str, ...], data_file_version: float
+) -> dict[str, ClubStats]:
+    club_data = load_club_data(data_file_path=data_file_path)
+
+    # если к списку только добавились книги, пересчитываем лишь затронутые годы
+    key = (data_file_path, date_columns_subset)
+    last_club_data, last_stats_table = get_last_stats_table(key=key)
+    num_old_books = 0
+    if last_club_data is not None and is_prefix(
+        club_data=last_club_data, of_club_data=club_data
+    ):
+        num_old_books = last_club_data.num_books
+    else:
+        last_stats_table = {}
+    stats_table = update_stats_table(
+        stats_table=last_stats_table,
+        club_data=club_data,
+        num_old_books=num_old_books,
+        date_columns_subset=list(date_columns_subset),
+    )
+    set_last_stats_table(key=key, club_data=club_data, stats_table=stats_table)
+    return stats_table
+
+
+# все клубы вместе пересчитываются, когда меняется файл любого из них
+@st.cache_resource(max_entries=DATA_CACHE_MAX_ENTRIES)
+def get_cross_club_stats(
+    club_names: tuple[str, ...],
+    data_file_paths: tuple[str, ...],
+    date_columns_subsets: tuple[tuple[str, ...], ...],
+    data_file_versions: tuple[float, ...],
+) -> CrossClubStats:
+    cross_club_data = build_cross_club_data(
+        club_datas={
+            club_name: load_club_data(data_file_path=data_file_path)
+            for club_name, data_file_path in zip(club_names, data_file_paths)
+        },
+        date_columns_subsets={
+            club_name: list(date_columns_subset)
+            for club_name, date_columns_subset in zip(club_names, date_columns_subsets)
+        },
+    )
+    return compute_cross_club_stats(cross_club_data=cross_club_data)
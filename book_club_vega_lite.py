@@ -0,0 +1,162 @@
+import json
+
+import numpy as np
+
+from book_club_viz_utils import ClubStats
+
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+AUTHOR_BAR_HEIGHT_IN_PIXELS = 20
+
+
+def get_bar_spec(
+    values_by_freq: list[tuple[str, int]], label_title: str | None, count_title: str
+) -> dict:
+    """Bar chart with the values in the given order along the x axis."""
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "data": {
+            "values": [
+                {"label": value, "count": count} for value, count in values_by_freq
+            ]
+        },
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "x": {
+                "field": "label",
+                "type": "ordinal",
+                "sort": None,
+                "title": label_title,
+            },
+            "y": {"field": "count", "type": "quantitative", "title": count_title},
+        },
+    }
+
+
+def get_pie_spec(values_by_freq: list[tuple[str, int]], unit: str) -> dict:
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "data": {
+            "values": [
+                {"label": value, "count": count} for value, count in values_by_freq
+            ]
+        },
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "count", "type": "quantitative", "title": unit},
+            "color": {"field": "label", "type": "nominal", "sort": None, "title": None},
+            "order": {"field": "count", "sort": "descending"},
+        },
+    }
+
+
+def get_authors_bar_spec(authors_by_freq: list[tuple[str, int]]) -> dict:
+    spec = get_bar_spec(
+        values_by_freq=authors_by_freq, label_title=None, count_title="Количество книг"
+    )
+    # горизонтальные столбцы: авторы по оси y, как в plot_authors_barh
+    x_encoding, y_encoding = spec["encoding"]["x"], spec["encoding"]["y"]
+    spec["encoding"] = {"x": y_encoding, "y": x_encoding}
+    spec["height"] = AUTHOR_BAR_HEIGHT_IN_PIXELS * len(authors_by_freq)
+    return spec
+
+
+def get_decades_bar_spec(decades: list[str], num_books: list[int]) -> dict:
+    # по позициям, а не по подписям: заглушка "..." может встречаться
+    # несколько раз, подписи подставляются на оси
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "data": {
+            "values": [
+                {"position": position, "decade": decade, "count": count}
+                for position, (decade, count) in enumerate(zip(decades, num_books))
+            ]
+        },
+        "mark": {"type": "bar", "tooltip": {"content": "data"}},
+        "encoding": {
+            "x": {
+                "field": "position",
+                "type": "ordinal",
+                "title": None,
+                "axis": {
+                    "labelExpr": f"{json.dumps(decades, ensure_ascii=False)}"
+                    "[datum.value]",
+                    "labelAngle": -75,
+                },
+            },
+            "y": {"field": "count", "type": "quantitative", "title": "Количество книг"},
+        },
+    }
+
+
+def get_pages_hist_spec(num_pages: list[int]) -> dict:
+    """
+    Histogram with the same 20 bins as plot_pages_hist, binned here so that
+    the spec carries one value per bin rather than one per book.
+    """
+    counts, bin_edges = np.histogram(num_pages, bins=20)
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "data": {
+            "values": [
+                {
+                    "bin_start": float(bin_start),
+                    "bin_end": float(bin_end),
+                    "count": int(count),
+                }
+                for bin_start, bin_end, count in zip(
+                    bin_edges[:-1], bin_edges[1:], counts
+                )
+            ]
+        },
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "x": {
+                "field": "bin_start",
+                "type": "quantitative",
+                "bin": "binned",
+                "title": "Количество страниц",
+            },
+            "x2": {"field": "bin_end"},
+            "y": {"field": "count", "type": "quantitative", "title": "Количество книг"},
+        },
+    }
+
+
+def get_vega_lite_specs(year_stats: ClubStats) -> dict[str, dict]:
+    """
+    Vega-Lite versions of the charts of get_chart_specs, by chart kind.
+
+    The specs carry only the aggregated values, and the charts are drawn
+    by the browser.
+    """
+    pages_per_month = [
+        (f"{period.month}-{period.year}", int(pages))
+        for period, pages in year_stats.pages_per_month.items()
+    ]
+    return {
+        "authors": get_authors_bar_spec(authors_by_freq=year_stats.authors_by_freq),
+        "book_countries": get_pie_spec(
+            values_by_freq=year_stats.book_countries_by_freq, unit="кн."
+        ),
+        "author_countries": get_pie_spec(
+            values_by_freq=year_stats.author_countries_by_freq, unit="ав."
+        ),
+        "author_genders_bar": get_bar_spec(
+            values_by_freq=year_stats.author_genders_by_freq,
+            label_title=None,
+            count_title="Количество авторов",
+        ),
+        "author_genders_pie": get_pie_spec(
+            values_by_freq=year_stats.author_genders_by_freq, unit="ав."
+        ),
+        "decades": get_decades_bar_spec(
+            decades=year_stats.decades, num_books=year_stats.books_per_decade
+        ),
+        "genres": get_pie_spec(values_by_freq=year_stats.genres_by_freq, unit="кн."),
+        "pages_per_month": get_bar_spec(
+            values_by_freq=pages_per_month,
+            label_title=None,
+            count_title="Количество страниц",
+        ),
+        "pages_hist": get_pages_hist_spec(num_pages=year_stats.num_pages),
+    }
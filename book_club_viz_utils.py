@@ -1,11 +1,22 @@
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
-from itertools import groupby
-import streamlit as st
 
+from book_club_data import TITLE_KEY_COLUMN, ClubData, ingest_book_list
+
+ALL_YEARS = "все годы"
+
+AVG_NUM_WORDS_PER_PAGE = 300
+AVG_NUM_WORDS_PER_SENTENCE = 15
+PAPER_THICKNESS_IN_METERS = 0.000103
 
-@st.cache_data
-def read_data_file(data_file_path: str) -> pd.DataFrame:
-    return pd.read_excel(io=data_file_path)
+VALUE_FREQ = list[tuple[str, int]]
+
+# в таблице книг на странице; строки сверх этого числа - на следующих страницах
+BOOK_TABLE_PAGE_SIZE = 200
+# служебные столбцы, которые не показываются в таблице книг
+BOOK_TABLE_HIDDEN_COLUMNS = ["flyer_path"]
 
 
 def get_num_meetings_from_df(df: pd.DataFrame, date_columns_subset: list[str]) -> int:
@@ -57,6 +68,94 @@ def get_column_values_as_list(df: pd.DataFrame, column_name: str) -> list[str]:
     return column_values_flattened
 
 
+def count_values(values: pd.Series) -> tuple[pd.Index, np.ndarray, np.ndarray]:
+    """
+    Distinct values of a column, their counts and the positions of their
+    first appearance; categorical columns are counted by their codes.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values=values)
+    codes = codes[codes >= 0]  # -1 - пропущенное значение
+    counts = np.bincount(codes, minlength=len(uniques))
+    first_positions = np.full(len(uniques), len(codes))
+    np.minimum.at(first_positions, codes, np.arange(len(codes)))
+    present_codes = np.flatnonzero(counts)
+    return (
+        uniques[present_codes],
+        counts[present_codes],
+        first_positions[present_codes],
+    )
+
+
+def get_values_by_freq(values: pd.Series) -> VALUE_FREQ:
+    """
+    Counter(values).most_common() for a pandas column: values by descending
+    frequency, ties in order of first appearance.
+    """
+    uniques, counts, first_positions = count_values(values=values)
+    order = np.lexsort(keys=(first_positions, -counts))
+    return list(zip(uniques[order].to_list(), counts[order].tolist()))
+
+
+def get_most_frequent(values: pd.Series) -> VALUE_FREQ:
+    """
+    The most frequent values of a column with their count: one value, or
+    several on a tie (in order of first appearance). Empty for an empty
+    column.
+
+    Unlike get_values_by_freq, only the values with the maximal count are
+    selected, without sorting all of them.
+    """
+    uniques, counts, first_positions = count_values(values=values)
+    if len(counts) == 0:
+        return []
+    top = np.flatnonzero(counts == counts.max())
+    top = top[np.argsort(first_positions[top])]
+    return list(zip(uniques[top].to_list(), counts[top].tolist()))
+
+
+def get_pages_per_month(
+    df: pd.DataFrame, date_columns_subset: list[str]
+) -> "pd.Series[int]":
+    """
+    Sum the number of pages per month.
+
+    A book discussed before the 15th day of a month is considered to be read
+    in the previous month.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Book list with the "num_pages" column and the date columns.
+    date_columns_subset : list[str]
+        Year, month and day columns, e.g. ["meeting_year", "meeting_month",
+        "meeting_day"].
+
+    Returns
+    -------
+    pd.Series
+        Number of pages indexed by monthly pd.Period, sorted chronologically.
+    """
+    year_column, month_column, day_column = date_columns_subset
+    # номер месяца от начала эпохи (1970-01 -> 0), как у pd.Period
+    month_ordinals = (
+        (df[year_column].to_numpy() - 1970) * 12
+        + df[month_column].to_numpy()
+        - 1
+        - (df[day_column].to_numpy() < 15)
+    )
+    pages_per_month = (
+        df["num_pages"].groupby(by=month_ordinals).sum().sort_index().astype(int)
+    )
+    pages_per_month.index = pd.PeriodIndex.from_ordinals(
+        ordinals=pages_per_month.index, freq="M"
+    )
+    return pages_per_month
+
+
 def get_books_inflection(num_books: int) -> str:
     """
     TODO:
@@ -131,50 +230,267 @@ def get_genres_inflection(num_genres: int) -> str:
     return genre_inflection
 
 
-def is_dict_has_n_or_more_consecutive_values(dict_: dict, value: int, n: int) -> bool:
-    """TODO:"""
-    result = False
-    for val, val_consecutive_group in groupby(dict_.values()):
-        if val == 0 and len(list(val_consecutive_group)) >= n:
-            result = True
-            break
-    return result
+def get_num_table_pages(num_rows: int, page_size: int = BOOK_TABLE_PAGE_SIZE) -> int:
+    return max(1, (num_rows + page_size - 1) // page_size)
+
+
+def get_book_table_columns(books_df: pd.DataFrame) -> list[str]:
+    """Columns of books_df shown in the book table."""
+    return [
+        column_name
+        for column_name in books_df.columns
+        if column_name not in BOOK_TABLE_HIDDEN_COLUMNS
+    ]
+
+
+def get_book_table_page(
+    books_df: pd.DataFrame, page_number: int, page_size: int = BOOK_TABLE_PAGE_SIZE
+) -> pd.DataFrame:
+    """
+    Rows of the page_number-th (from 1) page of the book table, without
+    the hidden columns.
+    """
+    start = (page_number - 1) * page_size
+    return books_df.iloc[start : start + page_size][
+        get_book_table_columns(books_df=books_df)
+    ]
 
 
 DECADE = str  # "1911-1920"
 BOOK_NUM = int
 
 
-def shrink_dict_consecutive_values(
-    dict_: dict,
-    value_to_shrink: int,
-    num_consecutive_values_to_shrink: int,
-    fill_value: int | str,
+def get_books_per_decade(
+    years: "np.ndarray | pd.Series",
+    num_empty_decades_to_shrink: int = 3,
+    fill_value: DECADE = "...",
 ) -> tuple[list[DECADE], list[BOOK_NUM]]:
-    """TODO:"""
-    keys = list(dict_.keys())
-    values = list(dict_.values())
-
-    new_keys = []
-    new_values = []
-    cur_index = 0
-    for val, val_consecutive_group in groupby(values):
-        consecutive_val_list = list(val_consecutive_group)
-        if (
-            val == value_to_shrink
-            and len(consecutive_val_list) >= num_consecutive_values_to_shrink
-        ):
-            new_keys.append(keys[cur_index])
-            new_values.append(val)
-            new_keys.append(fill_value)
-            new_values.append(val)
-            cur_index = cur_index + len(consecutive_val_list) - 1
-            new_keys.append(keys[cur_index])
-            new_values.append(val)
-            cur_index += 1
+    """
+    Count books per decade ("1911-1920", "1921-1930", ...).
+
+    Runs of num_empty_decades_to_shrink or more empty decades are collapsed
+    into [first empty decade, fill_value, last empty decade], so books
+    spanning antiquity to today produce a short list.
+
+    Parameters
+    ----------
+    years : np.ndarray | pd.Series
+        Years the books were written or published; missing years are
+        skipped.
+    num_empty_decades_to_shrink : int
+        Minimal length of a run of empty decades to collapse.
+    fill_value : str
+        Label that replaces the middle of a collapsed run.
+
+    Returns
+    -------
+    tuple
+        Decade labels and the number of books per decade (0 for fill_value).
+    """
+    years = pd.Series(data=years).dropna().to_numpy(dtype=np.int64)
+    if len(years) == 0:
+        return [], []
+
+    # десятилетие 1911-1920 имеет номер 191
+    decade_numbers = (years - 1) // 10
+    first_decade_number = decade_numbers.min()
+    num_books = np.bincount(decade_numbers - first_decade_number)
+
+    # границы серий пустых десятилетий: [run_starts[i], run_ends[i])
+    is_empty = np.concatenate(([False], num_books == 0, [False]))
+    run_edges = np.flatnonzero(np.diff(is_empty.astype(np.int8)))
+    run_starts, run_ends = run_edges[::2], run_edges[1::2]
+    is_long_run = run_ends - run_starts >= num_empty_decades_to_shrink
+    run_starts, run_ends = run_starts[is_long_run], run_ends[is_long_run]
+
+    # в длинной серии оставляем первое десятилетие, заглушку на месте второго
+    # и последнее десятилетие, остальные выкидываем
+    is_dropped = np.zeros(len(num_books) + 1, dtype=np.int64)
+    np.add.at(is_dropped, run_starts + 2, 1)
+    np.add.at(is_dropped, run_ends - 1, -1)
+    is_kept = np.cumsum(is_dropped)[:-1] == 0
+    is_fill = np.zeros(len(num_books), dtype=bool)
+    is_fill[run_starts + 1] = True
+
+    kept_indices = np.flatnonzero(is_kept)
+    decade_starts = (kept_indices + first_decade_number) * 10 + 1
+    decades = [
+        fill_value if fill else f"{start}-{start + 9}"
+        for start, fill in zip(decade_starts.tolist(), is_fill[kept_indices].tolist())
+    ]
+    return decades, num_books[kept_indices].tolist()
+
+
+@dataclass
+class ClubStats:
+    """
+    All numbers shown on the statistics page for one year selector option
+    ("все годы" or "<year> год").
+
+    thickest_books and thinnest_books are the rows of books_df with the
+    largest and the smallest number of pages, most_popular_* are the most
+    frequent values (several on a tie in both cases).
+    """
+
+    books_df: pd.DataFrame
+    num_meetings: int
+    num_books: int
+    num_authors_uniq: int
+    num_genres_uniq: int
+    num_pages: list[int]
+    num_pages_total: int
+    pages_height_in_meters: float
+    num_words: int
+    num_sentences: float
+    thickest_books: pd.DataFrame
+    thinnest_books: pd.DataFrame
+    most_popular_genres: VALUE_FREQ
+    most_popular_authors: VALUE_FREQ
+    most_popular_countries: VALUE_FREQ
+    authors_by_freq: VALUE_FREQ
+    genres_by_freq: VALUE_FREQ
+    countries_by_freq: VALUE_FREQ
+    book_countries_by_freq: VALUE_FREQ
+    author_countries_by_freq: VALUE_FREQ
+    author_genders_by_freq: VALUE_FREQ
+    decades: list[DECADE]
+    books_per_decade: list[BOOK_NUM]
+    pages_per_month: "pd.Series[int]"
+
+
+def compute_year_stats(
+    club_data: ClubData, date_columns_subset: list[str]
+) -> ClubStats:
+    """Compute ClubStats for all the books in club_data."""
+    books_df = club_data.books.drop(columns=["book_id", TITLE_KEY_COLUMN])
+    books_df.index = pd.Index(data=range(1, len(books_df) + 1))
+    book_authors = club_data.book_authors
+    genres = club_data.book_genres["genre"]
+
+    countries = club_data.get_author_attribute(column_name="author_country")
+
+    first_title_book_ids = club_data.books.drop_duplicates(subset=TITLE_KEY_COLUMN)[
+        "book_id"
+    ]
+    book_countries = countries[book_authors["book_id"].isin(first_title_book_ids)]
+    authors_uniq = club_data.get_book_authors_uniq()
+    decades, books_per_decade = get_books_per_decade(
+        years=books_df["year_written_or_published"]
+    )
+
+    num_pages = books_df["num_pages"]
+    num_pages_total = int(num_pages.sum())
+    num_words = num_pages_total * AVG_NUM_WORDS_PER_PAGE
+
+    return ClubStats(
+        books_df=books_df,
+        num_meetings=get_num_meetings_from_df(
+            df=books_df, date_columns_subset=date_columns_subset
+        ),
+        num_books=len(books_df),
+        num_authors_uniq=len(authors_uniq),
+        num_genres_uniq=genres.nunique(),
+        num_pages=num_pages.to_list(),
+        num_pages_total=num_pages_total,
+        pages_height_in_meters=num_pages_total * PAPER_THICKNESS_IN_METERS,
+        num_words=num_words,
+        num_sentences=num_words / AVG_NUM_WORDS_PER_SENTENCE,
+        thickest_books=books_df.loc[num_pages == num_pages.max()],
+        thinnest_books=books_df.loc[num_pages == num_pages.min()],
+        most_popular_genres=get_most_frequent(values=genres),
+        most_popular_authors=get_most_frequent(values=book_authors["author"]),
+        most_popular_countries=get_most_frequent(values=countries),
+        authors_by_freq=get_values_by_freq(values=book_authors["author"]),
+        genres_by_freq=get_values_by_freq(values=genres),
+        countries_by_freq=get_values_by_freq(values=countries),
+        book_countries_by_freq=get_values_by_freq(values=book_countries),
+        author_countries_by_freq=get_values_by_freq(
+            values=authors_uniq["author_country"]
+        ),
+        author_genders_by_freq=get_values_by_freq(values=authors_uniq["author_gender"]),
+        decades=decades,
+        books_per_decade=books_per_decade,
+        pages_per_month=get_pages_per_month(
+            df=books_df, date_columns_subset=date_columns_subset
+        ),
+    )
+
+
+def compute_stats_table(
+    club_data: ClubData, date_columns_subset: list[str]
+) -> dict[str, ClubStats]:
+    """
+    Compute statistics for every year selector option at once.
+
+    Returns
+    -------
+    dict
+        Dict like {"все годы": ClubStats, "2014 год": ClubStats, ...}.
+    """
+    return update_stats_table(
+        stats_table={},
+        club_data=club_data,
+        num_old_books=0,
+        date_columns_subset=date_columns_subset,
+    )
+
+
+def update_stats_table(
+    stats_table: dict[str, ClubStats],
+    club_data: ClubData,
+    num_old_books: int,
+    date_columns_subset: list[str],
+) -> dict[str, ClubStats]:
+    """
+    Stats table of club_data, reusing stats_table computed for its first
+    num_old_books books.
+
+    When books are appended (a new meeting), only the "все годы" stats and
+    the stats of the years of the new books are recomputed.
+    """
+    year_column = date_columns_subset[0]
+    books = club_data.books
+    new_years = set(books.loc[books["book_id"] >= num_old_books, year_column])
+    updated_stats_table = {
+        ALL_YEARS: compute_year_stats(
+            club_data=club_data, date_columns_subset=date_columns_subset
+        )
+    }
+    for year, year_books in books.groupby(by=year_column, sort=True):
+        year_option = f"{year} год"
+        if year in new_years or year_option not in stats_table:
+            updated_stats_table[year_option] = compute_year_stats(
+                club_data=club_data.select_books(book_ids=year_books["book_id"]),
+                date_columns_subset=date_columns_subset,
+            )
         else:
-            new_keys.extend(keys[cur_index : cur_index + len(consecutive_val_list)])
-            new_values.extend(consecutive_val_list)
-            cur_index = cur_index + len(consecutive_val_list)
+            updated_stats_table[year_option] = stats_table[year_option]
+    return updated_stats_table
+
+
+def compute_club_stats(
+    df: pd.DataFrame, date_columns_subset: list[str], year: int | None = None
+) -> ClubStats:
+    """
+    Compute the statistics of a book list as read from the club's xlsx.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Book list with the columns of chitaem_vmeste_book_list.xlsx.
+    date_columns_subset : list
+        Year, month and day columns of the meetings (votings).
+    year : int | None
+        Only the books of this year are counted; None means all years.
 
-    return new_keys, new_values
+    Returns
+    -------
+    ClubStats
+        The same numbers the app shows for the year.
+    """
+    if year is not None:
+        df = df.loc[df[date_columns_subset[0]] == year]
+    return compute_year_stats(
+        club_data=ingest_book_list(books_df=df),
+        date_columns_subset=date_columns_subset,
+    )
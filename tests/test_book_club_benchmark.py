@@ -0,0 +1,16 @@
+import pandas as pd
+
+from book_club_benchmark import make_book_list
+from book_club_data import ingest_book_list
+
+
+def test_make_book_list_has_schema_of_real_book_list():
+    real_books_df = pd.read_excel(
+        io="chitaem_vmeste_files/chitaem_vmeste_book_list.xlsx", nrows=1
+    )
+    books_df = make_book_list(num_books=50)
+
+    assert books_df.columns.to_list() == real_books_df.columns.to_list()
+    club_data = ingest_book_list(books_df=books_df)
+    assert len(club_data.books) == 50
+    assert len(club_data.book_authors) >= 50
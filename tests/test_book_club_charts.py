@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from book_club_charts import (
+    FigureCache,
+    get_render_pool,
+    plot_pages_hist,
+    render_chart,
+    submit_render,
+)
+
+
+def test_figure_cache_evicts_least_recently_used():
+    figure_cache = FigureCache(max_bytes=10)
+    figure_cache.put(key=("a", "все годы", "hash", "png"), image=b"aaaa")
+    figure_cache.put(key=("b", "все годы", "hash", "png"), image=b"bbbb")
+    # "a" становится самым свежим, вытесняться должен "b"
+    assert figure_cache.get(key=("a", "все годы", "hash", "png")) == b"aaaa"
+    figure_cache.put(key=("c", "все годы", "hash", "png"), image=b"cccc")
+
+    assert figure_cache.get(key=("b", "все годы", "hash", "png")) is None
+    assert figure_cache.get(key=("a", "все годы", "hash", "png")) == b"aaaa"
+    assert figure_cache.num_bytes == 8
+
+
+def test_figure_cache_skips_images_larger_than_cache():
+    figure_cache = FigureCache(max_bytes=2)
+    figure_cache.put(key=("a", "все годы", "hash", "png"), image=b"aaaa")
+    assert len(figure_cache) == 0
+    assert figure_cache.num_bytes == 0
+
+
+def test_render_chart_in_process_pool():
+    chart_spec = (plot_pages_hist, {"num_pages": [100, 200, 300]})
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context(method="spawn")
+    ) as executor:
+        image = executor.submit(render_chart, chart_spec).result()
+    assert image.startswith(b"\x89PNG")
+
+
+def test_submit_render_replaces_broken_pool():
+    broken_pool = get_render_pool()
+    # рабочий процесс погибает, как от OOM killer
+    with pytest.raises(BrokenProcessPool):
+        broken_pool.submit(os._exit, 1).result()
+
+    future, render_pool = submit_render(
+        chart_spec=(plot_pages_hist, {"num_pages": [100, 200, 300]})
+    )
+    assert render_pool is not broken_pool
+    assert future.result().startswith(b"\x89PNG")
+    render_pool.shutdown()
+    get_render_pool.clear()
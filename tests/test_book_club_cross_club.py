@@ -0,0 +1,102 @@
+import pandas as pd
+
+from book_club_cross_club import (
+    BOOK_KEY_COLUMN,
+    CLUB_COLUMN,
+    build_cross_club_data,
+    compute_cross_club_stats,
+)
+from book_club_data import ingest_book_list
+
+
+def make_club_datas():
+    first_books_df = pd.DataFrame(
+        {
+            "title": ["«Мартин Иден»", "«Мы»"],
+            "author": ["[Джек Лондон]", "[Евгений Замятин]"],
+            "author_country": ["[США]", "[Россия]"],
+            "author_gender": ["[муж.]", "[муж.]"],
+            "year_written_or_published": [1909, 1920],
+            "genres": ["[реализм]", "[антиутопия]"],
+            "num_pages": [480, 224],
+            "meeting_year": [2014, 2015],
+            "meeting_month": [7, 1],
+            "meeting_day": [5, 20],
+        }
+    )
+    second_books_df = pd.DataFrame(
+        {
+            "title": ["«Белый клык»", "«мартин  иден»"],
+            "author": ["[Джек Лондон]", "[джек лондон]"],
+            "author_country": ["[Соединённые Штаты]", "[Соединённые Штаты]"],
+            "author_gender": ["[муж.]", "[муж.]"],
+            "year_written_or_published": [1906, 1909],
+            "genres": ["[Реализм]", "[реализм]"],
+            "num_pages": [288, 480],
+            "voting_year": [2023, 2024],
+            "voting_month": [3, 4],
+            "voting_day": [1, 2],
+        }
+    )
+    return (
+        {
+            "first": ingest_book_list(books_df=first_books_df),
+            "second": ingest_book_list(books_df=second_books_df),
+        },
+        {
+            "first": ["meeting_year", "meeting_month", "meeting_day"],
+            "second": ["voting_year", "voting_month", "voting_day"],
+        },
+    )
+
+
+def test_build_cross_club_data():
+    club_datas, date_columns_subsets = make_club_datas()
+    cross_club_data = build_cross_club_data(
+        club_datas=club_datas, date_columns_subsets=date_columns_subsets
+    )
+
+    books = cross_club_data.books
+    assert books["book_id"].to_list() == [0, 1, 2, 3]
+    assert books[CLUB_COLUMN].to_list() == ["first", "first", "second", "second"]
+    assert books["year"].to_list() == [2014, 2015, 2023, 2024]
+    # «Мартин Иден» Джека Лондона выбирали оба клуба
+    assert books[BOOK_KEY_COLUMN].to_list() == [0, 1, 2, 0]
+    # авторы и жанры сопоставляются по нормализованным названиям, страна
+    # берётся из первого клуба
+    assert cross_club_data.authors.to_dict(orient="records") == [
+        {"author": "Джек Лондон", "author_country": "США", "author_gender": "муж."},
+        {
+            "author": "Евгений Замятин",
+            "author_country": "Россия",
+            "author_gender": "муж.",
+        },
+    ]
+    assert cross_club_data.book_genres["genre"].to_list() == [
+        "реализм",
+        "антиутопия",
+        "реализм",
+        "реализм",
+    ]
+
+
+def test_compute_cross_club_stats():
+    club_datas, date_columns_subsets = make_club_datas()
+    cross_club_stats = compute_cross_club_stats(
+        cross_club_data=build_cross_club_data(
+            club_datas=club_datas, date_columns_subsets=date_columns_subsets
+        )
+    )
+
+    assert cross_club_stats.num_books_uniq == 3
+    assert cross_club_stats.club_overlap.to_numpy().tolist() == [[2, 1], [1, 2]]
+    assert cross_club_stats.shared_books.index.to_list() == [
+        ("Джек Лондон", "«Мартин Иден»")
+    ]
+    assert cross_club_stats.shared_authors.to_dict(orient="index") == {
+        "Джек Лондон": {"first": 1, "second": 2}
+    }
+    assert cross_club_stats.club_stats.genres_by_freq == [
+        ("реализм", 3),
+        ("антиутопия", 1),
+    ]
@@ -0,0 +1,278 @@
+import errno
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import book_club_data
+from book_club_data import (
+    canonicalize_key,
+    get_snapshot_dir,
+    ingest_book_list,
+    load_club_data,
+    normalize_keys,
+    read_club_data,
+    read_snapshot_manifest,
+    write_club_data,
+)
+
+
+def make_books_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "title": ["«Благие знамения»", "«Мы»"],
+            "author": ["[Терри Пратчетт, Нил Гейман]", "[Евгений Замятин]"],
+            "author_country": ["[Англия, Англия]", "[Россия]"],
+            "author_gender": ["[муж., муж.]", "[муж.]"],
+            "year_written_or_published": [1990, 1920],
+            "genres": ["[фэнтези, юмор]", "[антиутопия]"],
+            "num_pages": [416, 224],
+        }
+    )
+
+
+def test_ingest_book_list():
+    club_data = ingest_book_list(books_df=make_books_df())
+
+    assert club_data.books["book_id"].to_list() == [0, 1]
+    assert club_data.get_book_author_rows().to_dict(orient="records") == [
+        {
+            "book_id": 0,
+            "author": "Терри Пратчетт",
+            "author_country": "Англия",
+            "author_gender": "муж.",
+        },
+        {
+            "book_id": 0,
+            "author": "Нил Гейман",
+            "author_country": "Англия",
+            "author_gender": "муж.",
+        },
+        {
+            "book_id": 1,
+            "author": "Евгений Замятин",
+            "author_country": "Россия",
+            "author_gender": "муж.",
+        },
+    ]
+    assert club_data.book_genres["genre"].to_list() == [
+        "фэнтези",
+        "юмор",
+        "антиутопия",
+    ]
+    assert club_data.authors.to_dict(orient="records") == [
+        {
+            "author": "Евгений Замятин",
+            "author_country": "Россия",
+            "author_gender": "муж.",
+        },
+        {"author": "Нил Гейман", "author_country": "Англия", "author_gender": "муж."},
+        {
+            "author": "Терри Пратчетт",
+            "author_country": "Англия",
+            "author_gender": "муж.",
+        },
+    ]
+    assert club_data.authors["author_country"].cat.categories.to_list() == [
+        "Англия",
+        "Россия",
+    ]
+
+
+def test_ingest_book_list_skips_misaligned_authors(caplog):
+    books_df = make_books_df()
+    books_df.loc[0, "author_country"] = "[Англия]"
+    with caplog.at_level(logging.WARNING, logger="book_club_data"):
+        club_data = ingest_book_list(books_df=books_df)
+
+    assert "«Благие знамения»" in caplog.text
+    assert len(club_data.books) == 2
+    assert club_data.book_authors["book_id"].to_list() == [1]
+    assert club_data.authors["author"].to_list() == ["Евгений Замятин"]
+
+
+def test_ingest_book_list_keeps_first_values_of_conflicting_authors(caplog):
+    books_df = make_books_df()
+    books_df.loc[1, "author"] = "[Нил Гейман]"
+    with caplog.at_level(logging.WARNING, logger="book_club_data"):
+        club_data = ingest_book_list(books_df=books_df)
+
+    assert "Нил Гейман" in caplog.text
+    assert club_data.authors.to_dict(orient="records") == [
+        {"author": "Нил Гейман", "author_country": "Англия", "author_gender": "муж."},
+        {
+            "author": "Терри Пратчетт",
+            "author_country": "Англия",
+            "author_gender": "муж.",
+        },
+    ]
+
+
+def test_ingest_book_list_stores_years_as_integers():
+    books_df = make_books_df()
+    # незаполненный год превращает столбец xlsx во float
+    books_df["year_written_or_published"] = [1990.0, None]
+    club_data = ingest_book_list(books_df=books_df)
+    years = club_data.books["year_written_or_published"]
+    assert years.dtype == "Int64"
+    assert years.to_list() == [1990, pd.NA]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("«Мёртвые  души»", "мертвые души"),
+        ('"Мертвые души"', "мертвые души"),
+        ("Лев\u00a0Толстой ", "лев толстой"),
+        # NFKC: "ﬁ" - лигатура fi
+        ("ﬁesta", "fiesta"),
+    ],
+)
+def test_canonicalize_key(text, expected):
+    assert canonicalize_key(text=text) == expected
+
+
+def test_ingest_book_list_unifies_spellings():
+    books_df = make_books_df()
+    books_df.loc[1, "title"] = "«Благие Знамения»"
+    books_df.loc[1, "author"] = "[терри  пратчетт]"
+    books_df.loc[1, "author_country"] = "[Англия]"
+    books_df.loc[1, "genres"] = "[Фэнтези]"
+    club_data = ingest_book_list(books_df=books_df)
+
+    assert club_data.books["title_key"].to_list() == [
+        "благие знамения",
+        "благие знамения",
+    ]
+    assert club_data.book_authors["author"].to_list() == [
+        "Терри Пратчетт",
+        "Нил Гейман",
+        "Терри Пратчетт",
+    ]
+    assert club_data.book_genres["genre"].to_list() == ["фэнтези", "юмор", "фэнтези"]
+
+
+def test_normalize_keys():
+    values = pd.Series(data=["Мы", " мы ", "Мартин  Иден"], dtype="category")
+    assert normalize_keys(values=values).to_list() == ["мы", "мы", "мартин иден"]
+
+
+def test_write_and_read_club_data(tmp_path):
+    club_data = ingest_book_list(books_df=make_books_df())
+    write_club_data(club_data=club_data, snapshot_dir=tmp_path)
+    club_data_read = read_club_data(snapshot_dir=tmp_path)
+
+    pd.testing.assert_frame_equal(club_data_read.books, club_data.books)
+    pd.testing.assert_frame_equal(club_data_read.authors, club_data.authors)
+    pd.testing.assert_frame_equal(club_data_read.book_authors, club_data.book_authors)
+    pd.testing.assert_frame_equal(club_data_read.book_genres, club_data.book_genres)
+
+
+def test_load_club_data_rebuilds_snapshot_only_on_content_change(tmp_path):
+    data_file_path = str(tmp_path / "book_list.xlsx")
+    make_books_df().to_excel(data_file_path, index=False)
+
+    club_data = load_club_data(data_file_path=data_file_path)
+    snapshot_dir = get_snapshot_dir(data_file_path=data_file_path)
+    manifest = read_snapshot_manifest(snapshot_dir=snapshot_dir)
+    assert manifest is not None
+    assert len(club_data.books) == 2
+
+    # меняется только mtime - снимок не перестраивается
+    books_table_mtime = (snapshot_dir / "books.parquet").stat().st_mtime_ns
+    os.utime(data_file_path, (0, manifest["mtime"] + 10))
+    load_club_data(data_file_path=data_file_path)
+    assert (snapshot_dir / "books.parquet").stat().st_mtime_ns == books_table_mtime
+    assert read_snapshot_manifest(snapshot_dir=snapshot_dir)["mtime"] == (
+        manifest["mtime"] + 10
+    )
+
+    # меняется содержимое - снимок перестраивается
+    make_books_df().iloc[:1].to_excel(data_file_path, index=False)
+    club_data = load_club_data(data_file_path=data_file_path)
+    assert len(club_data.books) == 1
+    assert len(read_club_data(snapshot_dir=snapshot_dir).books) == 1
+
+
+def test_load_club_data_ingests_only_appended_rows(tmp_path, monkeypatch):
+    data_file_path = str(tmp_path / "book_list.xlsx")
+    books_df = make_books_df()
+    books_df.iloc[:1].to_excel(data_file_path, index=False)
+    load_club_data(data_file_path=data_file_path)
+
+    ingested_num_rows = []
+
+    def ingest_book_list_spy(books_df, first_book_id=0):
+        ingested_num_rows.append(len(books_df))
+        return ingest_book_list(books_df=books_df, first_book_id=first_book_id)
+
+    monkeypatch.setattr(book_club_data, "ingest_book_list", ingest_book_list_spy)
+    books_df.to_excel(data_file_path, index=False)
+    club_data = load_club_data(data_file_path=data_file_path)
+
+    assert ingested_num_rows == [1]
+    expected_club_data = ingest_book_list(books_df=books_df)
+    pd.testing.assert_frame_equal(club_data.books, expected_club_data.books)
+    pd.testing.assert_frame_equal(club_data.authors, expected_club_data.authors)
+    pd.testing.assert_frame_equal(
+        club_data.book_authors, expected_club_data.book_authors
+    )
+    pd.testing.assert_frame_equal(club_data.book_genres, expected_club_data.book_genres)
+    snapshot_dir = get_snapshot_dir(data_file_path=data_file_path)
+    assert read_snapshot_manifest(snapshot_dir=snapshot_dir)["num_rows"] == 2
+
+    # правка уже загруженной строки - снимок строится заново целиком
+    books_df.loc[0, "num_pages"] = 400
+    books_df.to_excel(data_file_path, index=False)
+    club_data = load_club_data(data_file_path=data_file_path)
+    assert ingested_num_rows == [1, 2]
+    assert club_data.books["num_pages"].to_list() == [400, 224]
+
+
+def test_load_club_data_builds_snapshot_once_for_concurrent_loads(
+    tmp_path, monkeypatch
+):
+    data_file_path = str(tmp_path / "book_list.xlsx")
+    make_books_df().to_excel(data_file_path, index=False)
+
+    ingested_num_rows = []
+
+    def ingest_book_list_spy(books_df, first_book_id=0):
+        ingested_num_rows.append(len(books_df))
+        return ingest_book_list(books_df=books_df, first_book_id=first_book_id)
+
+    monkeypatch.setattr(book_club_data, "ingest_book_list", ingest_book_list_spy)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(load_club_data, data_file_path=data_file_path)
+            for _ in range(4)
+        ]
+        club_data_list = [future.result() for future in futures]
+
+    assert ingested_num_rows == [2]
+    assert all(len(club_data.books) == 2 for club_data in club_data_list)
+    snapshot_dir = get_snapshot_dir(data_file_path=data_file_path)
+    assert len(read_club_data(snapshot_dir=snapshot_dir).books) == 2
+    assert not list(snapshot_dir.glob("*.tmp"))
+
+
+@pytest.mark.parametrize(
+    ("error_number", "is_fallback"), [(errno.EROFS, True), (errno.ENOENT, False)]
+)
+def test_load_club_data_falls_back_only_on_read_only_errors(
+    tmp_path, monkeypatch, error_number, is_fallback
+):
+    data_file_path = str(tmp_path / "book_list.xlsx")
+    make_books_df().to_excel(data_file_path, index=False)
+
+    def write_club_data_failing(club_data, snapshot_dir):
+        raise OSError(error_number, os.strerror(error_number))
+
+    monkeypatch.setattr(book_club_data, "write_club_data", write_club_data_failing)
+    if is_fallback:
+        assert len(load_club_data(data_file_path=data_file_path).books) == 2
+    else:
+        with pytest.raises(FileNotFoundError):
+            load_club_data(data_file_path=data_file_path)
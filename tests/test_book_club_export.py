@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from book_club_configs import CHITAEM_VMESTE_CONFIG
+from book_club_data import ingest_book_list
+from book_club_export import build_year_page, get_page_name, markdown_to_html
+from book_club_viz_utils import ALL_YEARS, compute_stats_table
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Прочитано: **31** книга.", "Прочитано: <b>31</b> книга."),
+        (
+            "Самая тонкая книга: **Замятин *«Мы»*** (224 стр.).",
+            "Самая тонкая книга: <b>Замятин <i>«Мы»</i></b> (224 стр.).",
+        ),
+        (
+            "- США: 2 кн. (66.7%)\n- Россия: 1 кн. (33.3%)\n",
+            "<ul><li>США: 2 кн. (66.7%)</li><li>Россия: 1 кн. (33.3%)</li></ul>",
+        ),
+        (
+            "ВК: https://vk.com/chitaemvmestealmaty/",
+            (
+                'ВК: <a href="https://vk.com/chitaemvmestealmaty/">'
+                "https://vk.com/chitaemvmestealmaty/</a>"
+            ),
+        ),
+        ("<script>", "&lt;script&gt;"),
+    ],
+)
+def test_markdown_to_html(text, expected):
+    assert markdown_to_html(text=text) == expected
+
+
+def test_get_page_name():
+    assert get_page_name(year_option="все годы") == "index"
+    assert get_page_name(year_option="2014 год") == "2014"
+
+
+def test_build_year_page_hides_book_table_columns():
+    books_df = pd.DataFrame(
+        {
+            "title": ["«Мы»"],
+            "author": ["[Евгений Замятин]"],
+            "author_country": ["[Россия]"],
+            "author_gender": ["[муж.]"],
+            "year_written_or_published": [1920],
+            "genres": ["[антиутопия]"],
+            "num_pages": [224],
+            "meeting_year": [2014],
+            "meeting_month": [7],
+            "meeting_day": [5],
+            "flyer_path": [None],
+        }
+    )
+    stats_table = compute_stats_table(
+        club_data=ingest_book_list(books_df=books_df),
+        date_columns_subset=list(CHITAEM_VMESTE_CONFIG.date_columns),
+    )
+    page = build_year_page(
+        config=CHITAEM_VMESTE_CONFIG,
+        year_stats=stats_table[ALL_YEARS],
+        year_option=ALL_YEARS,
+        year_options=list(stats_table),
+    )
+    assert "<th>title</th>" in page
+    assert "flyer_path" not in page
@@ -0,0 +1,107 @@
+import book_club_reviews
+from book_club_reviews import ReviewStore, get_reviewer_name
+
+
+def make_review(book_author: str, book_title: str, reviewer: str) -> dict:
+    return {
+        "date": "2021-07-10",
+        "reviewer": reviewer,
+        "reviewer_alias": "",
+        "book_author": book_author,
+        "book_title": book_title,
+        "review": f"Отзыв {reviewer}",
+    }
+
+
+def test_review_store_index():
+    review_store = ReviewStore(
+        reviews=[
+            make_review(book_author="Евгений Замятин", book_title="«Мы»", reviewer="a"),
+            make_review(
+                book_author="Кобо Абэ", book_title="«Женщина в песках»", reviewer="b"
+            ),
+            make_review(book_author="Евгений Замятин", book_title="«Мы»", reviewer="c"),
+        ]
+    )
+    assert review_store.book_keys == [
+        ("Евгений Замятин", "«Мы»"),
+        ("Кобо Абэ", "«Женщина в песках»"),
+    ]
+    book_reviews = review_store.get_reviews(book_key=("Евгений Замятин", "«Мы»"))
+    assert [review["reviewer"] for review in book_reviews] == ["a", "c"]
+
+
+def test_review_store_index_matches_spelling_variants():
+    review_store = ReviewStore(
+        reviews=[
+            make_review(
+                book_author="Николай Гоголь", book_title="«Мёртвые души»", reviewer="a"
+            ),
+            make_review(
+                book_author="николай гоголь", book_title='"Мертвые души"', reviewer="b"
+            ),
+        ]
+    )
+    assert review_store.book_keys == [("Николай Гоголь", "«Мёртвые души»")]
+    book_reviews = review_store.get_reviews(book_key=("Николай Гоголь", "Мертвые души"))
+    assert [review["reviewer"] for review in book_reviews] == ["a", "b"]
+
+
+def test_review_store_canonicalizes_book_keys_once(monkeypatch):
+    review_store = ReviewStore(
+        reviews=[
+            make_review(book_author="Евгений Замятин", book_title="«Мы»", reviewer="a"),
+            make_review(book_author="Евгений Замятин", book_title="Мы", reviewer="b"),
+        ]
+    )
+
+    def fail(text: str) -> str:
+        raise AssertionError(f"canonicalize_key({text!r}) after indexing")
+
+    monkeypatch.setattr(book_club_reviews, "canonicalize_key", fail)
+    book_keys, _ = review_store.search(query="Замятин")
+    assert book_keys == [("Евгений Замятин", "«Мы»")]
+
+
+def test_review_store_pages():
+    review_store = ReviewStore(
+        reviews=[
+            make_review(book_author=f"Автор {i}", book_title="«Книга»", reviewer="a")
+            for i in range(5)
+        ]
+    )
+    assert review_store.get_num_pages(books_per_page=2) == 3
+    assert review_store.get_page(page=3, books_per_page=2) == [("Автор 4", "«Книга»")]
+    assert ReviewStore(reviews=[]).get_num_pages() == 1
+
+
+def test_get_reviewer_name():
+    review = make_review(
+        book_author="Кобо Абэ", book_title="«Женщина в песках»", reviewer="a"
+    )
+    assert get_reviewer_name(review=review) == "a"
+    review["reviewer_alias"] = "b"
+    assert get_reviewer_name(review=review) == "b"
+
+
+def test_review_store_search():
+    reviews = [
+        make_review(book_author="Евгений Замятин", book_title="«Мы»", reviewer="a"),
+        make_review(book_author="Евгений Замятин", book_title="«Мы»", reviewer="b"),
+        make_review(
+            book_author="Кобо Абэ", book_title="«Женщина в песках»", reviewer="c"
+        ),
+    ]
+    reviews[0]["review"] = "Говорят, это легло в основу романа Оруэлла."
+    reviews[2]["review"] = "Про ёжиков в песках."
+    review_store = ReviewStore(reviews=reviews)
+
+    # слово запроса в другой форме находится по основе
+    book_keys, review_positions = review_store.search(query="оруэллу")
+    assert book_keys == [("Евгений Замятин", "«Мы»")]
+    assert review_positions == {0}
+
+    # все слова запроса должны встретиться в одном отзыве
+    assert review_store.search(query="Замятин песках") == ([], set())
+    assert review_store.search(query="Абэ ежики")[1] == {2}
+    assert review_store.search(query="Замятин")[1] == {0, 1}
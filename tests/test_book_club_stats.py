@@ -0,0 +1,37 @@
+import pandas as pd
+
+from book_club_data import ingest_book_list
+from book_club_stats import (
+    DATA_CACHE_MAX_ENTRIES,
+    get_last_stats_table,
+    get_last_stats_tables,
+    set_last_stats_table,
+)
+
+
+def test_last_stats_tables_keep_only_recently_used_files():
+    get_last_stats_tables.clear()
+    club_data = ingest_book_list(
+        books_df=pd.DataFrame(
+            {
+                "title": ["«Мы»"],
+                "author": ["[Евгений Замятин]"],
+                "author_country": ["[Россия]"],
+                "author_gender": ["[муж.]"],
+                "year_written_or_published": [1920],
+                "genres": ["[антиутопия]"],
+                "num_pages": [224],
+            }
+        )
+    )
+    keys = [(f"club_{i}.xlsx", ("year",)) for i in range(DATA_CACHE_MAX_ENTRIES + 1)]
+    for key in keys[:-1]:
+        set_last_stats_table(key=key, club_data=club_data, stats_table={})
+    # первый файл использовали недавно - вытесняется второй
+    assert get_last_stats_table(key=keys[0])[0] is club_data
+    set_last_stats_table(key=keys[-1], club_data=club_data, stats_table={})
+
+    assert len(get_last_stats_tables()) == DATA_CACHE_MAX_ENTRIES
+    assert get_last_stats_table(key=keys[1]) == (None, {})
+    assert get_last_stats_table(key=keys[0])[0] is club_data
+    get_last_stats_tables.clear()
@@ -0,0 +1,51 @@
+import pytest
+
+from book_club_charts import CHART_BACKEND_ENV_VAR, get_chart_backend
+from book_club_vega_lite import (
+    get_bar_spec,
+    get_decades_bar_spec,
+    get_pages_hist_spec,
+)
+
+
+def test_get_bar_spec_keeps_order_of_values():
+    spec = get_bar_spec(
+        values_by_freq=[("муж.", 3), ("жен.", 5)],
+        label_title=None,
+        count_title="Количество авторов",
+    )
+    assert spec["data"]["values"] == [
+        {"label": "муж.", "count": 3},
+        {"label": "жен.", "count": 5},
+    ]
+    assert spec["encoding"]["x"]["sort"] is None
+
+
+def test_get_decades_bar_spec_keeps_repeated_labels_apart():
+    spec = get_decades_bar_spec(
+        decades=["1800-1809", "...", "1900-1909", "...", "2000-2009"],
+        num_books=[1, 0, 2, 0, 3],
+    )
+    assert [value["position"] for value in spec["data"]["values"]] == [0, 1, 2, 3, 4]
+    assert spec["encoding"]["x"]["axis"]["labelExpr"] == (
+        '["1800-1809", "...", "1900-1909", "...", "2000-2009"][datum.value]'
+    )
+
+
+def test_get_pages_hist_spec_sends_bins():
+    spec = get_pages_hist_spec(num_pages=[100, 100, 300] + [200] * 97)
+    values = spec["data"]["values"]
+    assert len(values) == 20
+    assert values[0] == {"bin_start": 100.0, "bin_end": 110.0, "count": 2}
+    assert values[-1] == {"bin_start": 290.0, "bin_end": 300.0, "count": 1}
+    assert sum(value["count"] for value in values) == 100
+
+
+def test_get_chart_backend(monkeypatch):
+    monkeypatch.delenv(CHART_BACKEND_ENV_VAR, raising=False)
+    assert get_chart_backend() == "matplotlib"
+    monkeypatch.setenv(CHART_BACKEND_ENV_VAR, "vega_lite")
+    assert get_chart_backend() == "vega_lite"
+    monkeypatch.setenv(CHART_BACKEND_ENV_VAR, "svg")
+    with pytest.raises(ValueError):
+        get_chart_backend()
@@ -1,7 +1,20 @@
 import pandas as pd
 import pytest
 
-from book_club_viz_utils import get_num_meetings_from_df
+from book_club_data import ingest_book_list
+from book_club_viz_utils import (
+    ALL_YEARS,
+    compute_club_stats,
+    compute_stats_table,
+    get_book_table_page,
+    get_books_per_decade,
+    get_most_frequent,
+    get_num_meetings_from_df,
+    get_num_table_pages,
+    get_pages_per_month,
+    get_values_by_freq,
+    update_stats_table,
+)
 
 
 @pytest.mark.parametrize(
@@ -73,3 +86,237 @@ def test_get_num_meetings_from_df(
         df=input_df, date_columns_subset=date_columns_subset
     )
     assert output == expected_output
+
+
+@pytest.mark.parametrize(
+    "input_df, expected_output",
+    [
+        # до 15 числа - страницы относятся к предыдущему месяцу
+        (
+            pd.DataFrame({"num_pages": [100], "y": [2001], "m": [5], "d": [14]}),
+            {pd.Period("2001-04"): 100},
+        ),
+        (
+            pd.DataFrame({"num_pages": [100], "y": [2001], "m": [5], "d": [15]}),
+            {pd.Period("2001-05"): 100},
+        ),
+        # январь переходит в декабрь предыдущего года
+        (
+            pd.DataFrame({"num_pages": [100], "y": [2001], "m": [1], "d": [1]}),
+            {pd.Period("2000-12"): 100},
+        ),
+        # суммирование в одном месяце и сортировка по времени
+        (
+            pd.DataFrame(
+                {
+                    "num_pages": [300, 100, 200],
+                    "y": [2002, 2001, 2001],
+                    "m": [1, 3, 2],
+                    "d": [20, 10, 20],
+                }
+            ),
+            {pd.Period("2001-02"): 300, pd.Period("2002-01"): 300},
+        ),
+    ],
+)
+def test_get_pages_per_month(input_df: pd.DataFrame, expected_output: dict):
+    output = get_pages_per_month(df=input_df, date_columns_subset=["y", "m", "d"])
+    assert output.to_dict() == expected_output
+    assert output.index.is_monotonic_increasing
+
+
+@pytest.mark.parametrize(
+    "years, expected_output",
+    [
+        # нет книг
+        ([], ([], [])),
+        # год, кратный 10, относится к уходящему десятилетию
+        ([1920, 1921], (["1911-1920", "1921-1930"], [1, 1])),
+        # две пустые декады подряд не сжимаются
+        (
+            [1905, 1935],
+            (["1901-1910", "1911-1920", "1921-1930", "1931-1940"], [1, 0, 0, 1]),
+        ),
+        # три и больше пустых декады сжимаются
+        (
+            [1905, 1945, 1945],
+            (
+                ["1901-1910", "1911-1920", "...", "1931-1940", "1941-1950"],
+                [1, 0, 0, 0, 2],
+            ),
+        ),
+        # книги без года не учитываются
+        (
+            pd.Series(data=[1905, None, 1915], dtype="Int64"),
+            (["1901-1910", "1911-1920"], [1, 1]),
+        ),
+        # несколько серий пустых декад
+        (
+            [1325, 1815, 1855, 2023],
+            (
+                [
+                    "1321-1330",
+                    "1331-1340",
+                    "...",
+                    "1801-1810",
+                    "1811-1820",
+                    "1821-1830",
+                    "...",
+                    "1841-1850",
+                    "1851-1860",
+                    "1861-1870",
+                    "...",
+                    "2011-2020",
+                    "2021-2030",
+                ],
+                [1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1],
+            ),
+        ),
+    ],
+)
+def test_get_books_per_decade(years: list[int], expected_output: tuple):
+    output = get_books_per_decade(years=years)
+    assert output == expected_output
+
+
+DATE_COLUMNS = ["meeting_year", "meeting_month", "meeting_day"]
+
+
+def make_books_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "title": ["«А»", "«Б»", "«В»"],
+            "author": ["[Автор 1]", "[Автор 2]", "[Автор 1]"],
+            "author_country": ["[США]", "[Россия]", "[США]"],
+            "author_gender": ["[муж.]", "[жен.]", "[муж.]"],
+            "year_written_or_published": [1925, 1953, 1999],
+            "genres": ["[реализм]", "[фантастика, антиутопия]", "[реализм]"],
+            "num_pages": [100, 200, 300],
+            "meeting_year": [2014, 2015, 2015],
+            "meeting_month": [7, 1, 2],
+            "meeting_day": [5, 20, 20],
+        }
+    )
+
+
+def test_compute_stats_table_keys():
+    stats_table = compute_stats_table(
+        club_data=ingest_book_list(books_df=make_books_df()),
+        date_columns_subset=DATE_COLUMNS,
+    )
+    assert list(stats_table) == [ALL_YEARS, "2014 год", "2015 год"]
+
+
+def test_compute_stats_table_year_stats():
+    stats_table = compute_stats_table(
+        club_data=ingest_book_list(books_df=make_books_df()),
+        date_columns_subset=DATE_COLUMNS,
+    )
+
+    all_years_stats = stats_table[ALL_YEARS]
+    assert all_years_stats.num_books == 3
+    assert all_years_stats.num_meetings == 3
+    assert all_years_stats.num_authors_uniq == 2
+    assert all_years_stats.authors_by_freq == [("Автор 1", 2), ("Автор 2", 1)]
+    assert all_years_stats.author_countries_by_freq == [("США", 1), ("Россия", 1)]
+
+    year_stats = stats_table["2015 год"]
+    assert year_stats.num_books == 2
+    assert year_stats.num_genres_uniq == 3
+    assert list(year_stats.books_df.index) == [1, 2]
+    assert year_stats.pages_per_month.to_dict() == {
+        pd.Period("2015-01"): 200,
+        pd.Period("2015-02"): 300,
+    }
+
+
+def test_compute_club_stats():
+    all_years_stats = compute_club_stats(
+        df=make_books_df(), date_columns_subset=DATE_COLUMNS
+    )
+    assert all_years_stats.num_pages_total == 600
+    assert all_years_stats.num_words == 600 * 300
+    assert all_years_stats.thickest_books["title"].to_list() == ["«В»"]
+    assert all_years_stats.thinnest_books["title"].to_list() == ["«А»"]
+
+    year_stats = compute_club_stats(
+        df=make_books_df(), date_columns_subset=DATE_COLUMNS, year=2015
+    )
+    assert year_stats.num_books == 2
+    assert year_stats.authors_by_freq == [("Автор 2", 1), ("Автор 1", 1)]
+    assert year_stats.thinnest_books["title"].to_list() == ["«Б»"]
+
+
+def test_update_stats_table_recomputes_only_years_of_new_books():
+    books_df = make_books_df()
+    stats_table = compute_stats_table(
+        club_data=ingest_book_list(books_df=books_df.iloc[:2]),
+        date_columns_subset=DATE_COLUMNS,
+    )
+    updated_stats_table = update_stats_table(
+        stats_table=stats_table,
+        club_data=ingest_book_list(books_df=books_df),
+        num_old_books=2,
+        date_columns_subset=DATE_COLUMNS,
+    )
+
+    assert list(updated_stats_table) == [ALL_YEARS, "2014 год", "2015 год"]
+    assert updated_stats_table["2014 год"] is stats_table["2014 год"]
+    assert updated_stats_table["2015 год"].num_books == 2
+    assert updated_stats_table[ALL_YEARS].num_books == 3
+
+
+@pytest.mark.parametrize("dtype", [object, "category"])
+def test_get_values_by_freq(dtype):
+    values = pd.Series(data=["США", "Россия", "Англия", "Россия", "США", "Чили"])
+    values = values.astype(dtype=dtype)
+    assert get_values_by_freq(values=values) == [
+        ("США", 2),
+        ("Россия", 2),
+        ("Англия", 1),
+        ("Чили", 1),
+    ]
+
+
+def test_get_values_by_freq_skips_unused_categories():
+    values = pd.Series(data=["США", "Россия", "США"], dtype="category")
+    assert get_values_by_freq(values=values.iloc[1:]) == [
+        ("Россия", 1),
+        ("США", 1),
+    ]
+
+
+@pytest.mark.parametrize("dtype", [object, "category"])
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (["США", "Россия", "США"], [("США", 2)]),
+        # ничья - в порядке первого появления
+        (["Чили", "США", "Россия", "США", "Чили"], [("Чили", 2), ("США", 2)]),
+        # одно значение за год
+        (["реализм"], [("реализм", 1)]),
+        ([], []),
+    ],
+)
+def test_get_most_frequent(values, expected, dtype):
+    values = pd.Series(data=values, dtype=object).astype(dtype=dtype)
+    assert get_most_frequent(values=values) == expected
+
+
+@pytest.mark.parametrize(
+    "num_rows, expected", [(0, 1), (1, 1), (2, 1), (3, 2), (4, 2), (5, 3)]
+)
+def test_get_num_table_pages(num_rows, expected):
+    assert get_num_table_pages(num_rows=num_rows, page_size=2) == expected
+
+
+def test_get_book_table_page():
+    books_df = make_books_df()
+    books_df["flyer_path"] = None
+    books_df.index = pd.Index(data=range(1, len(books_df) + 1))
+
+    table_page = get_book_table_page(books_df=books_df, page_number=2, page_size=2)
+
+    assert table_page.index.to_list() == [3]
+    assert table_page["title"].to_list() == ["«В»"]
+    assert "flyer_path" not in table_page.columns
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).parent.parent
+
+
+def get_import_times(module_name: str) -> dict[str, int]:
+    """
+    Cumulative import time (in microseconds) of every module imported by
+    `import module_name` in a fresh interpreter, as reported by
+    python -X importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    # строки вида "import time:       123 |       4567 |   package.module"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_time, imported_module = line.split(sep="|")
+        import_times[imported_module.strip()] = int(cumulative_time)
+    return import_times
+
+
+def test_viz_utils_imports_without_streamlit_and_matplotlib():
+    import_times = get_import_times(module_name="book_club_viz_utils")
+    assert "streamlit" not in import_times
+    assert "matplotlib" not in import_times
+
+
+@pytest.mark.parametrize("module_name", ["book_club_dashboard", "book_club_charts"])
+def test_app_modules_import_without_matplotlib(module_name):
+    import_times = get_import_times(module_name=module_name)
+    assert "matplotlib" not in import_times
+
+
+def test_startup_import_time_report(capsys):
+    import_times = get_import_times(module_name="book_club_dashboard")
+    top_level_times = {
+        module_name: import_time
+        for module_name, import_time in import_times.items()
+        if "." not in module_name
+    }
+    with capsys.disabled():
+        print("\nimport time of book_club_dashboard (top 10 packages):")
+        for module_name, import_time in sorted(
+            top_level_times.items(), key=lambda item: item[1], reverse=True
+        )[:10]:
+            print(f"{import_time / 1000:>10.1f} ms  {module_name}")